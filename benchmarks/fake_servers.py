@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Fake Servers - Local stand-ins for the Telegram Bot API and GitHub contents API
+Used by the benchmarks so the full pipeline can run without network access
+"""
+
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON request handler; subclasses implement route()"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self) -> dict:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _reply(self, status: int, payload: dict = None, headers: dict = None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.route(method, self._body() if method in ('POST', 'PUT') else {})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+
+class _TelegramHandler(_JsonHandler):
+    def route(self, method: str, body: dict):
+        match = re.match(r'^/bot([^/]+)/(\w+)', self.path)
+        if not match:
+            return self._reply(404, {'ok': False, 'description': 'Not Found'})
+
+        api_method = match.group(2)
+        server = self.server
+        if api_method == 'getMe':
+            bot_id = int(match.group(1).split(':', 1)[0]) if match.group(1)[0].isdigit() else 1
+            return self._reply(200, {'ok': True, 'result': {'id': bot_id, 'is_bot': True,
+                                                            'username': 'fake_quran_bot'}})
+        if api_method == 'sendMessage':
+            with server.lock:
+                server.messages.append(body)
+                message_id = len(server.messages)
+            return self._reply(200, {'ok': True, 'result': {'message_id': message_id,
+                                                            'chat': {'id': body.get('chat_id')},
+                                                            'text': body.get('text')}})
+        if api_method == 'getUpdates':
+            with server.lock:
+                offset = int(body.get('offset') or 0)
+                updates = [u for u in server.updates if u['update_id'] >= offset]
+            return self._reply(200, {'ok': True, 'result': updates})
+        return self._reply(200, {'ok': True, 'result': True})
+
+
+class _GitHubHandler(_JsonHandler):
+    def route(self, method: str, body: dict):
+        match = re.match(r'^/repos/[^/]+/[^/]+/contents/(.+)$', self.path)
+        if not match:
+            return self._reply(404, {'message': 'Not Found'})
+
+        path = match.group(1)
+        server = self.server
+        with server.lock:
+            current = server.files.get(path)
+            if method == 'GET':
+                if current is None:
+                    return self._reply(404, {'message': 'Not Found'})
+                etag = f'"{current["sha"]}"'
+                if self.headers.get('If-None-Match') == etag:
+                    return self._reply(304, headers={'ETag': etag})
+                return self._reply(200, {
+                    'path': path, 'sha': current['sha'],
+                    'content': base64.b64encode(current['content']).decode('ascii'),
+                    'encoding': 'base64',
+                }, headers={'ETag': etag})
+
+            if method == 'PUT':
+                if current is not None and body.get('sha') != current['sha']:
+                    return self._reply(409, {'message': f'{path} does not match {body.get("sha")}'})
+                content = base64.b64decode(body['content'])
+                sha = hashlib.sha1(content).hexdigest()
+                server.files[path] = {'sha': sha, 'content': content}
+                return self._reply(201 if current is None else 200,
+                                   {'content': {'path': path, 'sha': sha}})
+
+        return self._reply(405, {'message': 'Method Not Allowed'})
+
+
+class FakeServer:
+    """Runs a handler on an ephemeral localhost port in a background thread"""
+
+    handler = None
+
+    def __init__(self, latency: float = 0.0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self.handler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeTelegramServer(FakeServer):
+    """Bot API stand-in: getMe, sendMessage (recorded) and getUpdates"""
+
+    handler = _TelegramHandler
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        self.httpd.messages = []
+        self.httpd.updates = []
+
+    @property
+    def messages(self) -> list:
+        return self.httpd.messages
+
+
+class FakeGitHubServer(FakeServer):
+    """Contents API stand-in with SHA/ETag semantics"""
+
+    handler = _GitHubHandler
+
+    def __init__(self, latency: float = 0.0, files: dict = None):
+        super().__init__(latency)
+        self.httpd.files = {}
+        for path, content in (files or {}).items():
+            self.put_file(path, content)
+
+    def put_file(self, path: str, content: bytes):
+        self.httpd.files[path] = {'sha': hashlib.sha1(content).hexdigest(), 'content': content}
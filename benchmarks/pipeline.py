@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark - End-to-end latency of GitHubActionsQuranBot
+Runs the bot against local fake Telegram and GitHub servers and reports
+p50/p95/p99 for every stage plus fan-out throughput
+
+Usage:
+    python benchmarks/pipeline.py [quran_dataset.csv] [--iterations N] [--fanout 100,500]
+                                  [--latency SECONDS] [--json results.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fake_servers import FakeGitHubServer, FakeTelegramServer  # noqa: E402
+from fanout import ChannelRegistry  # noqa: E402
+from github_actions_bot import GitHubActionsQuranBot  # noqa: E402
+from rate_limiter import OutboundScheduler  # noqa: E402
+
+BOT_TOKEN = "123456:benchmark"
+
+
+def summarize(samples: list) -> dict:
+    """Percentiles in milliseconds"""
+    ms = [s * 1000 for s in samples]
+    cuts = statistics.quantiles(ms, n=100, method='inclusive') if len(ms) > 1 else ms * 99
+    return {
+        'samples': len(ms),
+        'mean_ms': statistics.fmean(ms),
+        'p50_ms': cuts[49],
+        'p95_ms': cuts[94],
+        'p99_ms': cuts[98],
+    }
+
+
+def timed(func, iterations: int) -> list:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(csv_file_path: str, iterations: int, fanout_sizes: list, latency: float,
+        backend: str) -> dict:
+    state = json.dumps({'current_index': 0}).encode('utf-8')
+
+    with FakeTelegramServer(latency) as telegram, \
+            FakeGitHubServer(latency, {'bot_state.json': state}) as github, \
+            tempfile.TemporaryDirectory() as workdir:
+        os.environ['GITHUB_TOKEN'] = 'benchmark'
+        os.environ['GITHUB_REPOSITORY'] = 'bench/quran-bot'
+
+        def make_bot(channels=None, concurrency=16):
+            bot = GitHubActionsQuranBot(
+                BOT_TOKEN, '1', csv_file_path, dataset_backend=backend, channels=channels,
+                fanout_concurrency=concurrency, telegram_api_url=telegram.url,
+                github_api_url=github.url, journal_path=os.path.join(workdir, 'journal.db'))
+            # Measure the pipeline, not Telegram's flood limits
+            bot.outbound = OutboundScheduler(global_rate=1e9)
+            return bot
+
+        results = {'stages': {}, 'fanout': []}
+        stages = results['stages']
+
+        stages['startup'] = summarize(timed(lambda i: make_bot(), iterations))
+
+        bot = make_bot()
+        total = len(bot.verses_data)
+        indexes = [random.randrange(total) for _ in range(iterations)]
+
+        stages['load_dataset'] = summarize(timed(lambda i: bot.load_dataset(), iterations))
+        stages['load_state_from_github'] = summarize(
+            timed(lambda i: bot.load_state(), iterations))
+        stages['format_verse_message'] = summarize(
+            timed(lambda i: bot.format_verse_message(bot.get_verse(indexes[i])), iterations))
+        stages['render_verse_message'] = summarize(
+            timed(lambda i: bot.render_verse_message(indexes[i]), iterations))
+        bot.verse_index  # built once up front, like a resident interactive bot
+        stages['answer_command'] = summarize(
+            timed(lambda i: bot.answer_command('/random'), iterations))
+        # A popular query, answered from the response cache after the first call
+        stages['answer_command_cached'] = summarize(
+            timed(lambda i: bot.answer_command('/verse 1:1'), iterations))
+
+        message = bot.render_verse_message(indexes[0])
+        # A fresh chat per call so per-chat buckets never throttle the measurement
+        stages['send_message'] = summarize(
+            timed(lambda i: bot.send_message(message, str(1000 + i)), iterations))
+        # Same, plus the write-ahead journal claim/confirm around each send
+        stages['send_verse_journaled'] = summarize(
+            timed(lambda i: bot.send_verse(message, str(5000 + i)), iterations))
+
+        for size in fanout_sizes:
+            channels = ChannelRegistry(str(100000 + n) for n in range(size))
+            fan_bot = make_bot(channels, concurrency=min(size, 64))
+            start = time.perf_counter()
+            report = fan_bot.broadcast_message(message)
+            elapsed = time.perf_counter() - start
+            results['fanout'].append({
+                'chats': size,
+                'delivered': len(report.succeeded),
+                'seconds': elapsed,
+                'messages_per_second': size / elapsed if elapsed else None,
+            })
+
+        results['http'] = bot.http.stats()
+        results['telegram_messages_received'] = len(telegram.messages)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_file_path', nargs='?', default='quran_dataset.csv')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--fanout', default='100,500', help='comma separated chat counts')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='artificial per-request server latency in seconds')
+    parser.add_argument('--backend', default='auto', help='dataset backend to benchmark')
+    parser.add_argument('--json', dest='json_path', help='write machine-readable results here')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    random.seed(0)
+
+    results = run(os.path.abspath(args.csv_file_path), args.iterations,
+                  [int(n) for n in args.fanout.split(',') if n], args.latency, args.backend)
+    results['config'] = vars(args)
+
+    print(f"{'stage':<26}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, s in results['stages'].items():
+        print(f"{stage:<26}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}")
+    for f in results['fanout']:
+        print(f"fan-out {f['chats']:>5} chats: {f['delivered']} delivered in "
+              f"{f['seconds']:.2f}s ({f['messages_per_second']:.0f} msg/s)")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - Cold-start cost of each dataset backend
+Every sample runs in a fresh interpreter so import time is included
+
+Usage:
+    python benchmarks/startup.py [quran_dataset.csv] [--runs N] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter: import the reader, open the dataset, fetch one verse
+PROBE = """
+import time
+start = time.perf_counter()
+from dataset_backends import open_dataset
+imported = time.perf_counter()
+data = open_dataset({csv!r}, {backend!r})
+data.row(len(data) // 2)
+loaded = time.perf_counter()
+print(imported - start, loaded - imported)
+"""
+
+
+def measure(csv_file_path: str, backend: str, runs: int) -> dict:
+    """Time a backend over several cold interpreter starts"""
+    import_times, load_times, totals = [], [], []
+    for _ in range(runs):
+        probe = PROBE.format(csv=csv_file_path, backend=backend)
+        out = subprocess.run([sys.executable, '-c', probe], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        import_s, load_s = map(float, out.stdout.split())
+        import_times.append(import_s * 1000)
+        load_times.append(load_s * 1000)
+        totals.append((import_s + load_s) * 1000)
+
+    return {
+        'backend': backend,
+        'runs': runs,
+        'import_ms': statistics.median(import_times),
+        'load_ms': statistics.median(load_times),
+        'total_ms': statistics.median(totals),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_file_path', nargs='?', default='quran_dataset.csv')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--backends', default='pandas,csv,indexed,store,parquet',
+                        help='comma separated list, pandas is the pre-refactor baseline')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    csv_file_path = os.path.abspath(args.csv_file_path)
+    results = []
+    for backend in args.backends.split(','):
+        try:
+            results.append(measure(csv_file_path, backend, args.runs))
+        except subprocess.CalledProcessError as e:
+            print(f"⚠️ Skipping {backend}: {e.stderr.strip().splitlines()[-1]}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'backend':<10}{'import ms':>12}{'load ms':>12}{'total ms':>12}")
+    for r in results:
+        print(f"{r['backend']:<10}{r['import_ms']:>12.1f}{r['load_ms']:>12.1f}{r['total_ms']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Webhook Benchmark - POSTs fixture updates to the bot's webhook server
+Runs the bot against a local fake Telegram server, checks the secret token,
+de-duplication and inline replies, and reports per-update latency
+
+Usage:
+    python benchmarks/webhook.py [quran_dataset.csv] [--updates N] [--connections C]
+                                 [--json results.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fake_servers import FakeTelegramServer  # noqa: E402
+from github_actions_bot import GitHubActionsQuranBot  # noqa: E402
+from pipeline import BOT_TOKEN, summarize  # noqa: E402
+from rate_limiter import OutboundScheduler  # noqa: E402
+from webhook import SECRET_HEADER, WebhookServer  # noqa: E402
+
+SECRET = 'benchmark-secret'
+COMMANDS = ('/verse 2:3', '/random', '/verse 3:1-2', '/help', 'just chatting')
+
+
+def fixture_update(update_id: int, text: str, chat_id: int) -> dict:
+    """A private-chat message update shaped like Telegram's"""
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Bench'},
+            'text': text,
+        },
+    }
+
+
+def run(csv_file_path: str, updates: int, connections: int) -> dict:
+    with FakeTelegramServer() as telegram:
+        bot = GitHubActionsQuranBot(BOT_TOKEN, '1', csv_file_path, telegram_api_url=telegram.url,
+                                    state_backend='file', journal_path=None)
+        # Measure the receiver, not Telegram's flood limits
+        bot.outbound = OutboundScheduler(global_rate=1e9)
+        bot.verse_index  # resident bots have it loaded after the first lookup
+
+        server = WebhookServer(bot.webhook_reply, SECRET, host='127.0.0.1', port=0,
+                               workers=connections)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        server.ready.wait(10)
+        url = f"http://127.0.0.1:{server.port}{server.path}"
+
+        local = threading.local()
+
+        def post(update: dict, secret: str = SECRET):
+            session = getattr(local, 'session', None)
+            if session is None:
+                session = local.session = requests.Session()
+            start = time.perf_counter()
+            response = session.post(url, json=update, headers={SECRET_HEADER: secret}, timeout=10)
+            return response, time.perf_counter() - start
+
+        checks = {
+            'wrong_secret_status': post(fixture_update(1, '/help', 7), 'wrong')[0].status_code,
+            'inline_reply_method': post(fixture_update(2, '/verse 2:3', 7))[0].json().get('method'),
+            'duplicate_body': post(fixture_update(2, '/verse 2:3', 7))[0].content.decode() or None,
+        }
+
+        fixtures = [fixture_update(100 + i, COMMANDS[i % len(COMMANDS)], 10000 + i)
+                    for i in range(updates)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            responses = list(pool.map(post, fixtures))
+        elapsed = time.perf_counter() - started
+
+        server.stop()
+        thread.join(10)
+
+        return {
+            'checks': checks,
+            'latency': summarize([seconds for _, seconds in responses]),
+            'updates_per_second': updates / elapsed if elapsed else None,
+            'inline_replies': server.inline_replies,
+            'outbound_messages': len(telegram.messages),
+            'duplicates': server.duplicates,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv_file_path', nargs='?', default='quran_dataset.csv')
+    parser.add_argument('--updates', type=int, default=1000)
+    parser.add_argument('--connections', type=int, default=8,
+                        help='parallel webhook connections, like setWebhook max_connections')
+    parser.add_argument('--json', dest='json_path', help='write machine-readable results here')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = run(os.path.abspath(args.csv_file_path), args.updates, args.connections)
+    results['config'] = vars(args)
+
+    latency = results['latency']
+    print(f"checks: {results['checks']}")
+    print(f"{args.updates} updates: {results['updates_per_second']:.0f} updates/s, "
+          f"p50 {latency['p50_ms']:.2f} ms, p95 {latency['p95_ms']:.2f} ms, p99 {latency['p99_ms']:.2f} ms")
+    print(f"inline replies: {results['inline_replies']}, "
+          f"outbound sendMessage calls: {results['outbound_messages']}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Chunker - Split messages that exceed Telegram's 4096 character limit
+Cuts prefer paragraph, line, sentence and word boundaries, never fall inside a
+Markdown/HTML entity or escape sequence and never separate an Arabic letter from
+its diacritics.
+"""
+
+import re
+import unicodedata
+
+# Telegram counts message length in UTF-16 code units
+MESSAGE_LIMIT = 4096
+
+# Spans a cut must not fall inside: backslash escapes, *bold*, _italic_, `code`,
+# [text](url), single-line HTML elements and HTML character references
+_ENTITY = re.compile(
+    r'\\.|\*[^*\n]+\*|_[^_\n]+_|`[^`\n]+`|\[[^\]\n]+\]\([^)\n]+\)'
+    r'|<([a-z-]+)[^<>\n]*>[^<\n]*</\1>|&#?\w+;')
+
+# Boundaries in order of preference; a cut goes right after the separator
+_SEPARATORS = ('\n\n', '\n', '. ', '! ', '? ', '؟ ', '۔ ', '۝', '، ', ' ')
+
+_JOINERS = {'‌', '‍', '͏'}
+
+
+def utf16_len(text: str) -> int:
+    """Length as Telegram measures it"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _is_grapheme_boundary(text: str, pos: int) -> bool:
+    """Whether a cut before text[pos] keeps combining marks with their base letter"""
+    if pos <= 0 or pos >= len(text):
+        return True
+    char = text[pos]
+    if unicodedata.combining(char) or char in _JOINERS or 0xFE00 <= ord(char) <= 0xFE0F:
+        return False
+    return text[pos - 1] not in _JOINERS
+
+
+def _hard_limit(text: str, limit: int) -> int:
+    """Largest prefix length (in code points) that fits in limit UTF-16 units"""
+    units = 0
+    for i, char in enumerate(text):
+        units += 2 if ord(char) > 0xFFFF else 1
+        if units > limit:
+            return i
+    return len(text)
+
+
+def _best_cut(text: str, limit: int):
+    """Return (cut position, marker); marker is the entity delimiter to close and
+    reopen when an entity is longer than a whole message and has to be split"""
+    hard = _hard_limit(text, limit)
+    # Entities never span lines, so scanning to the end of the current line is enough
+    line_end = text.find('\n', hard)
+    spans = [m.span() for m in _ENTITY.finditer(text, 0, len(text) if line_end == -1 else line_end)]
+
+    def inside(pos: int):
+        return next(((start, end) for start, end in spans if start < pos < end), None)
+
+    def allowed(pos: int) -> bool:
+        return _is_grapheme_boundary(text, pos) and inside(pos) is None
+
+    # Avoid tiny chunks: only take a boundary in the second half of the window
+    floor = hard // 2
+    for separator in _SEPARATORS:
+        pos = text.rfind(separator, floor, hard)
+        while pos != -1:
+            cut = pos + len(separator)
+            if cut <= hard and allowed(cut):
+                return cut, ''
+            pos = text.rfind(separator, floor, pos)
+
+    # No natural boundary: cut as late as grapheme and entity rules allow
+    for cut in range(hard, floor, -1):
+        if allowed(cut):
+            return cut, ''
+
+    # An entity longer than the window: split it (after a space if possible),
+    # leaving room to close it here and reopen it in the next chunk
+    space = text.rfind(' ', floor, hard - 1)
+    candidates = ([space + 1] if space != -1 else []) + list(range(hard - 1, 0, -1))
+    for cut in candidates:
+        if _is_grapheme_boundary(text, cut):
+            span = inside(cut)
+            marker = text[span[0]] if span and text[span[0]] in '*_`' else ''
+            return cut, marker
+    return hard, ''
+
+
+def iter_chunks(text: str, limit: int = MESSAGE_LIMIT):
+    """Yield pieces of text that each fit in one Telegram message"""
+    remaining = text
+    while utf16_len(remaining) > limit:
+        cut, marker = _best_cut(remaining, limit)
+        chunk = remaining[:cut].rstrip()
+        if chunk:
+            yield chunk + marker
+        remaining = marker + remaining[cut:].lstrip('\n ')
+    if remaining:
+        yield remaining
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT) -> list:
+    """All chunks of text at once"""
+    return list(iter_chunks(text, limit))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Columnar Dataset - Optional Parquet copy of the Quran dataset
+Columns are stored separately and rows are split into small row groups, so a
+reader decodes only the projected columns of the row group holding a verse.
+surah_name_en (114 distinct values) is dictionary-encoded.
+
+Needs pyarrow ('pip install pyarrow'); the bot works without it.
+
+Usage:
+    python columnar.py quran_dataset.csv [quran_dataset.parquet] [--row-group-size 256]
+"""
+
+import argparse
+import csv
+import logging
+import os
+
+from verse_store import file_sha256, matches_source
+
+logger = logging.getLogger(__name__)
+
+PARQUET_EXTENSION = '.parquet'
+
+# Small groups keep a single-verse read cheap; 256 rows is ~25 groups for 6236 verses
+DEFAULT_ROW_GROUP_SIZE = 256
+
+DICTIONARY_COLUMNS = ('surah_name_en',)
+
+# Schema metadata tying the file to the CSV it was converted from
+SOURCE_SIZE_KEY = b'quran_bot.source_size'
+SOURCE_SHA256_KEY = b'quran_bot.source_sha256'
+
+
+def parquet_path_for(csv_file_path: str) -> str:
+    """Return the Parquet path that sits next to a CSV dataset"""
+    return os.path.splitext(csv_file_path)[0] + PARQUET_EXTENSION
+
+
+def import_pyarrow():
+    """Import pyarrow and pyarrow.parquet, with an actionable error when missing"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("The columnar dataset format needs 'pip install pyarrow'") from e
+    return pyarrow, pyarrow.parquet
+
+
+def source_matches(metadata: dict, csv_file_path: str) -> bool:
+    """Whether Parquet schema metadata says the file was converted from this CSV"""
+    metadata = metadata or {}
+    try:
+        source_size = int(metadata.get(SOURCE_SIZE_KEY, -1))
+        source_sha256 = bytes.fromhex(metadata.get(SOURCE_SHA256_KEY, b'').decode('ascii'))
+    except (ValueError, UnicodeDecodeError):
+        return False
+    return matches_source(csv_file_path, source_size, source_sha256)
+
+
+def convert_csv(csv_file_path: str, parquet_file_path: str = None,
+                row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> str:
+    """Convert the CSV dataset to Parquet; values stay strings, as in every other backend"""
+    pa, pq = import_pyarrow()
+    parquet_file_path = parquet_file_path or parquet_path_for(csv_file_path)
+
+    with open(csv_file_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        columns = next(reader, None) or []
+        records = [record for record in reader if record]
+
+    arrays = []
+    for i, name in enumerate(columns):
+        values = pa.array([record[i] if i < len(record) else '' for record in records], pa.string())
+        arrays.append(values.dictionary_encode() if name in DICTIONARY_COLUMNS else values)
+
+    table = pa.Table.from_arrays(arrays, names=columns).replace_schema_metadata({
+        SOURCE_SIZE_KEY: str(os.path.getsize(csv_file_path)).encode('ascii'),
+        SOURCE_SHA256_KEY: file_sha256(csv_file_path).hex().encode('ascii'),
+    })
+
+    tmp_path = parquet_file_path + '.tmp'
+    pq.write_table(table, tmp_path, row_group_size=max(row_group_size, 1),
+                   use_dictionary=[name for name in DICTIONARY_COLUMNS if name in columns],
+                   compression='zstd')
+    os.replace(tmp_path, parquet_file_path)
+
+    logger.info(f"✅ Wrote {len(records)} verses to {parquet_file_path} "
+                f"({table.num_columns} columns, row groups of {row_group_size})")
+    return parquet_file_path
+
+
+def main():
+    """Convert the dataset given on the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Convert the Quran CSV dataset to Parquet")
+    parser.add_argument('csv_file_path', nargs='?', default='quran_dataset.csv')
+    parser.add_argument('parquet_file_path', nargs='?')
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    try:
+        convert_csv(args.csv_file_path, args.parquet_file_path, args.row_group_size)
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error converting dataset: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Dataset Backends - Pluggable readers for the Quran dataset
+The default readers only need the standard library; pandas and pyarrow are optional.
+Every reader takes an optional column projection and keeps only those columns,
+so memory grows with the translations in use rather than with the file's width.
+"""
+
+import array
+import bisect
+import csv
+import io
+import logging
+import os
+import struct
+import threading
+
+from columnar import import_pyarrow, parquet_path_for, source_matches
+from verse_store import VerseStore, file_sha256, store_path_for
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b'QIX1'
+INDEX_EXTENSION = '.idx'
+
+# magic, number of offsets, SHA-256 of the CSV the offsets were taken from
+_INDEX_HEADER = struct.Struct('<4sI32s')
+
+
+def index_path_for(csv_file_path: str) -> str:
+    """Return the row-offset sidecar path that sits next to a CSV dataset"""
+    return os.path.splitext(csv_file_path)[0] + INDEX_EXTENSION
+
+
+def scan_row_offsets(csv_file_path: str) -> array.array:
+    """Byte offset of every CSV record (header first) followed by the end of file
+
+    Quoted fields may contain newlines, so a record only ends on a line
+    boundary once an even number of quote characters has been seen.
+    """
+    offsets = array.array('Q')
+    pos = 0
+    quotes = 0
+    in_record = False
+    with open(csv_file_path, 'rb') as f:
+        for line in f:
+            if not in_record:
+                if not line.strip(b'\r\n'):
+                    pos += len(line)
+                    continue
+                offsets.append(pos)
+                in_record = True
+                quotes = 0
+            quotes += line.count(b'"')
+            pos += len(line)
+            if quotes % 2 == 0:
+                in_record = False
+    offsets.append(pos)
+    return offsets
+
+
+def load_row_index(csv_file_path: str) -> array.array:
+    """Load the sidecar index, regenerating it when it does not match the CSV hash"""
+    index_file_path = index_path_for(csv_file_path)
+    source_sha = file_sha256(csv_file_path)
+
+    try:
+        with open(index_file_path, 'rb') as f:
+            magic, count, indexed_sha = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+            if magic == INDEX_MAGIC and indexed_sha == source_sha:
+                offsets = array.array('Q')
+                offsets.frombytes(f.read(count * offsets.itemsize))
+                if len(offsets) == count:
+                    return offsets
+        logger.info(f"🔄 {index_file_path} does not match the dataset, rebuilding")
+    except (OSError, struct.error):
+        logger.info(f"📝 No usable row index at {index_file_path}, building one")
+
+    offsets = scan_row_offsets(csv_file_path)
+    try:
+        tmp_path = index_file_path + '.tmp'
+        with open(tmp_path, 'wb') as out:
+            out.write(_INDEX_HEADER.pack(INDEX_MAGIC, len(offsets), source_sha))
+            out.write(offsets.tobytes())
+        os.replace(tmp_path, index_file_path)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write {index_file_path}, using in-memory offsets: {e}")
+    return offsets
+
+
+class DatasetBackend:
+    """Common interface every dataset reader implements
+
+    columns, when given, is the projection: rows only carry those columns, and
+    self.columns lists the projected columns the dataset actually has.
+    """
+
+    name = None
+
+    def __init__(self, csv_file_path: str, columns=None):
+        self.csv_file_path = csv_file_path
+        self.projection = list(columns) if columns else None
+        self.columns = []
+
+    def _select(self, header: list) -> list:
+        """Set self.columns from the projection and return their positions in header"""
+        if self.projection is None:
+            self.columns = list(header)
+        else:
+            self.columns = [name for name in self.projection if name in header]
+        return [header.index(name) for name in self.columns]
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def row(self, index: int) -> dict:
+        """Return the verse at a position as a column -> value mapping"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the reader"""
+
+
+class CsvBackend(DatasetBackend):
+    """Zero-dependency reader built on the csv module"""
+
+    name = 'csv'
+
+    def __init__(self, csv_file_path: str, columns=None):
+        super().__init__(csv_file_path, columns)
+        with open(csv_file_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            positions = self._select(next(reader, None) or [])
+            # Unprojected fields are dropped while streaming, never held in memory
+            self._rows = [tuple(record[i] for i in positions) for record in reader if record]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row(self, index: int) -> dict:
+        return dict(zip(self.columns, self._rows[index]))
+
+
+class IndexedCsvBackend(DatasetBackend):
+    """CSV reader that seeks straight to a row using the sidecar offset index"""
+
+    name = 'indexed'
+
+    def __init__(self, csv_file_path: str, columns=None):
+        super().__init__(csv_file_path, columns)
+        self._offsets = load_row_index(csv_file_path)
+        self._file = open(csv_file_path, 'rb')
+        # Interactive and webhook handlers read rows from several threads at once
+        self._lock = threading.Lock()
+        self._positions = self._select(self._read_record(0) if len(self._offsets) > 1 else [])
+
+    def _read_record(self, position: int) -> list:
+        start, end = self._offsets[position], self._offsets[position + 1]
+        with self._lock:
+            self._file.seek(start)
+            data = self._file.read(end - start)
+        # Excel and Kaggle exports often start with a BOM; it must not end up in the header
+        text = data.decode('utf-8-sig' if start == 0 else 'utf-8')
+        return next(csv.reader(io.StringIO(text, newline='')))
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 2, 0)
+
+    def row(self, index: int) -> dict:
+        if not 0 <= index < len(self):
+            raise IndexError(f"Verse index {index} out of range (0-{len(self) - 1})")
+        record = self._read_record(index + 1)
+        return {name: record[i] for name, i in zip(self.columns, self._positions)}
+
+    def close(self):
+        self._file.close()
+
+
+class VerseStoreBackend(DatasetBackend):
+    """Memory-mapped reader over the compiled verse store"""
+
+    name = 'store'
+
+    def __init__(self, csv_file_path: str, columns=None):
+        super().__init__(csv_file_path, columns)
+        self.store_file_path = store_path_for(csv_file_path)
+        self._store = VerseStore(self.store_file_path)
+        self._select(self._store.columns)
+
+    def is_fresh(self) -> bool:
+        """Whether the store was compiled from the current CSV"""
+        return self._store.matches_source(self.csv_file_path)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def row(self, index: int) -> dict:
+        # Only the projected fields are sliced out of the map and decoded
+        return self._store.row(index, self.columns)
+
+    def close(self):
+        self._store.close()
+
+
+class PandasBackend(DatasetBackend):
+    """Optional reader for environments that already have pandas installed"""
+
+    name = 'pandas'
+
+    def __init__(self, csv_file_path: str, columns=None):
+        super().__init__(csv_file_path, columns)
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("The pandas dataset backend needs 'pip install pandas'") from e
+        wanted = set(self.projection) if self.projection else None
+        # Strings throughout, like the csv module, so rows compare equal across backends
+        self._frame = pd.read_csv(csv_file_path, dtype=str, keep_default_na=False,
+                                  usecols=(lambda name: name in wanted) if wanted else None)
+        self._select(list(self._frame.columns))
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    def row(self, index: int) -> dict:
+        return self._frame.iloc[index].to_dict()
+
+
+class ParquetBackend(DatasetBackend):
+    """Optional columnar reader over the Parquet copy made by columnar.py
+
+    A row read decodes only the projected columns of the row group that holds it;
+    the last decoded group is kept, so sequential reads cost one decode per group.
+    """
+
+    name = 'parquet'
+
+    def __init__(self, csv_file_path: str, columns=None):
+        super().__init__(csv_file_path, columns)
+        _, pq = import_pyarrow()
+        self.parquet_file_path = parquet_path_for(csv_file_path)
+        self._file = pq.ParquetFile(self.parquet_file_path, memory_map=True)
+        self._select(self._file.schema_arrow.names)
+
+        metadata = self._file.metadata
+        self._group_starts = []
+        self._rows = 0
+        for group in range(metadata.num_row_groups):
+            self._group_starts.append(self._rows)
+            self._rows += metadata.row_group(group).num_rows
+        self._group = None
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        """Whether the Parquet file was converted from the current CSV"""
+        return source_matches(self._file.schema_arrow.metadata, self.csv_file_path)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def row(self, index: int) -> dict:
+        if not 0 <= index < self._rows:
+            raise IndexError(f"Verse index {index} out of range (0-{self._rows - 1})")
+
+        group = bisect.bisect_right(self._group_starts, index) - 1
+        # Work on a local reference: another thread may swap self._group meanwhile
+        cached = self._group
+        if cached is None or cached[0] != group:
+            with self._lock:
+                table = self._file.read_row_group(group, columns=self.columns)
+            cached = self._group = (group, table.to_pydict())
+        values = cached[1]
+        offset = index - self._group_starts[group]
+        return {name: values[name][offset] for name in self.columns}
+
+    def close(self):
+        self._file.close()
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (CsvBackend, IndexedCsvBackend, VerseStoreBackend, PandasBackend, ParquetBackend)
+}
+
+
+def open_dataset(csv_file_path: str, backend: str = 'auto', columns=None) -> DatasetBackend:
+    """Open the dataset with a named backend, or pick the fastest available one
+
+    columns projects the dataset down to the listed columns (all of them by default).
+    """
+    if backend != 'auto':
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown dataset backend '{backend}', choose from {sorted(BACKENDS)}")
+        return BACKENDS[backend](csv_file_path, columns)
+
+    if os.path.exists(store_path_for(csv_file_path)):
+        store = VerseStoreBackend(csv_file_path, columns)
+        if store.is_fresh():
+            return store
+        logger.warning(f"⚠️ {store.store_file_path} is out of date, falling back to CSV")
+        store.close()
+
+    if os.path.exists(parquet_path_for(csv_file_path)):
+        try:
+            columnar = ParquetBackend(csv_file_path, columns)
+        except ImportError as e:
+            logger.warning(f"⚠️ Ignoring {parquet_path_for(csv_file_path)}: {e}")
+        else:
+            if columnar.is_fresh():
+                return columnar
+            logger.warning(f"⚠️ {columnar.parquet_file_path} is out of date, falling back to CSV")
+            columnar.close()
+
+    return IndexedCsvBackend(csv_file_path, columns)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Escaping - Safe text for Telegram's Markdown, MarkdownV2 and HTML parse modes
+Escaping uses precompiled str.translate tables (one linear pass, no regex), and
+the validators catch malformed markup before a message is sent.
+"""
+
+import re
+
+PARSE_MODES = ('Markdown', 'MarkdownV2', 'HTML')
+
+# Characters each mode requires to be escaped outside of entities
+_LEGACY_MARKDOWN_TABLE = str.maketrans({c: '\\' + c for c in '_*`['})
+_MARKDOWN_V2_TABLE = str.maketrans({c: '\\' + c for c in '\\_*[]()~`>#+-=|{}.!'})
+_HTML_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+_ESCAPE_TABLES = {
+    'Markdown': _LEGACY_MARKDOWN_TABLE,
+    'MarkdownV2': _MARKDOWN_V2_TABLE,
+    'HTML': _HTML_TABLE,
+}
+
+_BOLD = {
+    'Markdown': '*{}*',
+    'MarkdownV2': '*{}*',
+    'HTML': '<b>{}</b>',
+}
+
+
+class MessageFormatError(ValueError):
+    """Raised when a message would be rejected by Telegram's entity parser"""
+
+
+def escape(text, parse_mode: str = 'Markdown') -> str:
+    """Escape plain text so it renders literally in the given parse mode"""
+    return str(text).translate(_ESCAPE_TABLES[parse_mode])
+
+
+def bold(text, parse_mode: str = 'Markdown') -> str:
+    """Escaped text wrapped in the parse mode's bold entity"""
+    return _BOLD[parse_mode].format(escape(text, parse_mode))
+
+
+def _validate_markdown(text: str, v2: bool):
+    open_marks = set()
+    i = 0
+    n = len(text)
+    while i < n:
+        char = text[i]
+        if char == '\\':
+            if v2 and i + 1 >= n:
+                raise MessageFormatError("Dangling backslash at end of message")
+            i += 2
+            continue
+
+        if char == '`':
+            fence = '```' if text.startswith('```', i) else '`'
+            end = text.find(fence, i + len(fence))
+            if v2:
+                # Inside code only ` and \ are special, and they must be escaped
+                while end != -1 and text[end - 1] == '\\':
+                    end = text.find(fence, end + 1)
+            if end == -1:
+                raise MessageFormatError(f"Unclosed code entity at offset {i}")
+            i = end + len(fence)
+            continue
+
+        if char == '[':
+            close = text.find('](', i)
+            end = text.find(')', close + 2) if close != -1 else -1
+            if end == -1:
+                raise MessageFormatError(f"Unclosed link at offset {i}")
+            i = end + 1
+            continue
+
+        if char == '*' or char == '_' or (v2 and char == '~'):
+            mark = char
+            if v2 and char == '_' and text.startswith('__', i):
+                mark = '__'
+            if not v2 and open_marks and mark not in open_marks:
+                # Legacy Markdown cannot nest entities; other markers are literal inside one
+                i += 1
+                continue
+            open_marks ^= {mark}
+            i += len(mark)
+            continue
+
+        if v2 and char == '|':
+            if not text.startswith('||', i):
+                raise MessageFormatError(f"Unescaped '|' at offset {i}")
+            open_marks ^= {'||'}
+            i += 2
+            continue
+
+        if v2 and char in '()]#+-={}.!':
+            raise MessageFormatError(f"Unescaped '{char}' at offset {i}")
+        if v2 and char == '>' and i > 0 and text[i - 1] != '\n':
+            raise MessageFormatError(f"Unescaped '>' at offset {i}")
+        i += 1
+
+    if open_marks:
+        raise MessageFormatError(f"Unclosed entities: {sorted(open_marks)}")
+
+
+_HTML_TAG = re.compile(r'<(/?)([a-zA-Z-]+)[^<>]*>')
+_HTML_ENTITY = re.compile(r'&(?:#\d+|#x[0-9a-fA-F]+|[a-zA-Z]+);')
+_HTML_TAGS = {'b', 'strong', 'i', 'em', 'u', 'ins', 's', 'strike', 'del', 'a', 'code',
+              'pre', 'tg-spoiler', 'tg-emoji', 'span', 'blockquote'}
+
+
+def _validate_html(text: str):
+    stack = []
+    pos = 0
+    for match in _HTML_TAG.finditer(text):
+        if '<' in text[pos:match.start()] or '>' in text[pos:match.start()]:
+            raise MessageFormatError(f"Unescaped angle bracket before offset {match.start()}")
+        closing, tag = match.group(1), match.group(2).lower()
+        if tag not in _HTML_TAGS:
+            raise MessageFormatError(f"Unsupported tag <{tag}>")
+        if closing:
+            if not stack or stack.pop() != tag:
+                raise MessageFormatError(f"Mismatched </{tag}> at offset {match.start()}")
+        else:
+            stack.append(tag)
+        pos = match.end()
+
+    if '<' in text[pos:] or '>' in text[pos:]:
+        raise MessageFormatError("Unescaped angle bracket in text")
+    if stack:
+        raise MessageFormatError(f"Unclosed tags: {stack}")
+
+    for amp in (m.start() for m in re.finditer('&', text)):
+        if not _HTML_ENTITY.match(text, amp):
+            raise MessageFormatError(f"Unescaped '&' at offset {amp}")
+
+
+def validate(text: str, parse_mode: str):
+    """Raise MessageFormatError if Telegram would fail to parse the message"""
+    if parse_mode == 'HTML':
+        _validate_html(text)
+    elif parse_mode in ('Markdown', 'MarkdownV2'):
+        _validate_markdown(text, parse_mode == 'MarkdownV2')
+    elif parse_mode:
+        raise MessageFormatError(f"Unknown parse mode '{parse_mode}'")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Fan-out - Deliver one verse to many Telegram chats concurrently
+Sends run on a bounded worker pool driven by asyncio, with a per-chat report
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from translations import DEFAULT_TRANSLATIONS, parse_translations
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelRegistry:
+    """Ordered, de-duplicated set of chat ids the bot posts to
+
+    A chat may override which translation columns it receives; the others get
+    the bot-wide default.
+    """
+
+    def __init__(self, chat_ids=None):
+        self._chat_ids = []
+        self._translations = {}
+        for chat_id in chat_ids or []:
+            self.add(chat_id)
+
+    @classmethod
+    def from_sources(cls, primary: str = None, extra: str = None, channels_file: str = None):
+        """Build a registry from CHANNEL_ID, a comma-separated list and/or a JSON file
+
+        JSON entries are chat ids or {"chat_id": ..., "translations": ["ur", "en"]}.
+        """
+        registry = cls([primary] if primary else [])
+        for chat_id in (extra or '').split(','):
+            registry.add(chat_id)
+
+        if channels_file and os.path.exists(channels_file):
+            with open(channels_file, encoding='utf-8') as f:
+                for entry in json.load(f):
+                    if isinstance(entry, dict):
+                        registry.add(entry['chat_id'], entry.get('translations'))
+                    else:
+                        registry.add(entry)
+        return registry
+
+    def add(self, chat_id, translations=None):
+        chat_id = str(chat_id).strip()
+        if chat_id and chat_id not in self._chat_ids:
+            self._chat_ids.append(chat_id)
+        if chat_id and translations:
+            self._translations[chat_id] = parse_translations(translations)
+
+    def remove(self, chat_id):
+        chat_id = str(chat_id).strip()
+        if chat_id in self._chat_ids:
+            self._chat_ids.remove(chat_id)
+        self._translations.pop(chat_id, None)
+
+    def translations_for(self, chat_id, default: tuple = DEFAULT_TRANSLATIONS) -> tuple:
+        return self._translations.get(str(chat_id), default)
+
+    def groups(self, default: tuple = DEFAULT_TRANSLATIONS) -> dict:
+        """Translation tuple -> chat ids that receive it, so each variant renders once"""
+        groups = {}
+        for chat_id in self._chat_ids:
+            groups.setdefault(self.translations_for(chat_id, default), []).append(chat_id)
+        return groups
+
+    def save(self, channels_file: str):
+        entries = [
+            {'chat_id': chat_id, 'translations': list(self._translations[chat_id])}
+            if chat_id in self._translations else chat_id
+            for chat_id in self._chat_ids
+        ]
+        with open(channels_file, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+
+    def __contains__(self, chat_id) -> bool:
+        return str(chat_id) in self._chat_ids
+
+    def __iter__(self):
+        return iter(self._chat_ids)
+
+    def __len__(self) -> int:
+        return len(self._chat_ids)
+
+
+class FanoutReport:
+    """Outcome of one fan-out: chat id -> None on success or an error description"""
+
+    def __init__(self):
+        self.results = {}
+        self.elapsed = 0.0
+
+    @property
+    def succeeded(self) -> list:
+        return [chat_id for chat_id, error in self.results.items() if error is None]
+
+    @property
+    def failed(self) -> dict:
+        return {chat_id: error for chat_id, error in self.results.items() if error is not None}
+
+    def summary(self) -> str:
+        return (f"{len(self.succeeded)}/{len(self.results)} chats delivered "
+                f"in {self.elapsed:.2f}s")
+
+
+class FanoutSender:
+    """Sends one message to N chats with at most max_concurrency requests in flight
+
+    send_func(chat_id, message) is the blocking per-chat sender and returns a bool.
+    """
+
+    def __init__(self, send_func, max_concurrency: int = 16):
+        self.send_func = send_func
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def deliver_async(self, message: str, chat_ids) -> FanoutReport:
+        report = FanoutReport()
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(self.max_concurrency)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                thread_name_prefix='fanout') as pool:
+
+            async def deliver_one(chat_id):
+                async with limit:
+                    try:
+                        ok = await loop.run_in_executor(pool, self.send_func, chat_id, message)
+                        report.results[chat_id] = None if ok else 'send failed'
+                    except Exception as e:
+                        report.results[chat_id] = str(e)
+
+            await asyncio.gather(*(deliver_one(chat_id) for chat_id in chat_ids))
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def deliver(self, message: str, chat_ids) -> FanoutReport:
+        """Blocking entry point for callers that are not already inside an event loop"""
+        return asyncio.run(self.deliver_async(message, chat_ids))
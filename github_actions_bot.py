@@ -4,98 +4,223 @@ GitHub Actions Quran Bot - Posts one verse per run
 This version is specifically designed for GitHub Actions
 """
 
-import pandas as pd
-import requests
-import json
 import os
 import logging
-import base64
-from datetime import datetime
+import random
+import sys
+from datetime import datetime, timezone
+
+from chunker import split_message
+from dataset_backends import open_dataset
+from escaping import PARSE_MODES, MessageFormatError, escape, validate
+from fanout import ChannelRegistry, FanoutSender
+from http_session import GITHUB_API, TELEGRAM_API, HttpClient, request_not_sent
+from journal import CONFIRMED, PENDING, DeliveryInDoubt, PostJournal
+from morphology_index import MorphologyIndex, morphology_path_for
+from rate_limiter import GLOBAL_RATE, OutboundScheduler, RetryAfter
+from response_cache import ResponseCache
+from render_cache import RenderCache, render_footer, render_search_hit, render_verse_body, render_verse_card
+from scheduler import CronSchedule, Scheduler
+from search_index import load_search_index
+from state_store import STATE_BACKENDS, FileStateStore, GitHubStateStore, SqliteStateStore
+from translations import DEFAULT_TRANSLATIONS, parse_translations, required_columns
+from updates import POLL_TIMEOUT, UpdateEngine, UpdatePoller
+from webhook import WebhookServer
+from verse_index import load_verse_index
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Longest /verse range (and /surah preview) answered in one reply
+MAX_VERSES_PER_REPLY = 10
+
+# Results listed for a /search query
+MAX_SEARCH_RESULTS = 5
+
 class GitHubActionsQuranBot:
-    def __init__(self, bot_token: str, channel_id: str, csv_file_path: str):
+    def __init__(self, bot_token: str, channel_id: str, csv_file_path: str,
+                 dataset_backend: str = 'auto', channels: ChannelRegistry = None,
+                 fanout_concurrency: int = 16, global_rate: float = GLOBAL_RATE,
+                 probe_mode: str = 'cached', identity_ttl: int = 24 * 3600,
+                 telegram_api_url: str = TELEGRAM_API, github_api_url: str = GITHUB_API,
+                 state_backend: str = 'github', journal_path: str = "post_journal.db",
+                 post_schedule: str = "0 * * * *", catchup_policy: str = 'off',
+                 catchup_max: int = 24, parse_mode: str = 'Markdown',
+                 translations=DEFAULT_TRANSLATIONS, response_cache_entries: int = 1024,
+                 response_cache_bytes: int = 4 * 1024 * 1024, response_cache_ttl: float = 3600):
         self.bot_token = bot_token
         self.channel_id = channel_id
+        self.channels = channels or ChannelRegistry([channel_id])
+        self.fanout_concurrency = fanout_concurrency
+        self.outbound = OutboundScheduler(global_rate)
+        # Keep-alive pools sized so every fan-out worker can hold a connection
+        self.http = HttpClient(pool_size=max(fanout_concurrency, 1),
+                               hosts=(telegram_api_url, github_api_url))
         self.csv_file_path = csv_file_path
-        self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        self.dataset_backend = dataset_backend
+        self.github_api_url = github_api_url
+        self.base_url = f"{telegram_api_url}/bot{bot_token}"
+        if parse_mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode '{parse_mode}', choose from {PARSE_MODES}")
+        self.parse_mode = parse_mode
+        # Default translation columns; channels may pick their own
+        self.translations = parse_translations(translations)
         self.state_file = "bot_state.json"
         self.current_index = 0
+        self.cycle = 0
+        self.last_run = None
+        
+        # Catch-up after missed cron slots: 'off' (one verse per run), 'burst'
+        # (post every missed verse, up to catchup_max) or 'skip' (jump ahead, post one)
+        self.schedule = CronSchedule(post_schedule)
+        self.catchup_policy = catchup_policy
+        self.catchup_max = catchup_max
+        
+        # Write-ahead delivery journal so retried runs never post a verse twice
+        self.journal = PostJournal(journal_path) if journal_path else None
+        
+        # getMe probe: 'always', 'cached' (reuse identity for identity_ttl seconds)
+        # or 'optimistic' (never probe up front, only to diagnose a failed send)
+        self.probe_mode = probe_mode
+        self.identity_ttl = identity_ttl
+        self.bot_identity = None
+        
+        # Rendered command replies keyed by (query, language, format)
+        self.response_cache = ResponseCache(response_cache_entries, response_cache_bytes, response_cache_ttl)
         
         # Load dataset
         self.load_dataset()
         
-        # Load state from GitHub repository
-        self.load_state_from_github()
+        # Load state (from the GitHub repository by default)
+        self.state_store = self.create_state_store(state_backend)
+        self.load_state()
     
     def load_dataset(self):
-        """Load the Quran dataset from CSV file"""
+        """Load the Quran dataset, preferring the compiled verse store over the CSV"""
         try:
-            self.verses_data = pd.read_csv(self.csv_file_path)
-            logger.info(f"✅ Loaded {len(self.verses_data)} verses from dataset")
+            # Only the columns some channel needs are read and kept in memory
+            translation_sets = list(self.channels.groups(self.translations)) or [self.translations]
+            projected_columns = required_columns(translation_sets)
+            self.verses_data = open_dataset(self.csv_file_path, self.dataset_backend, projected_columns)
+            logger.info(f"✅ Loaded {len(self.verses_data)} verses from dataset "
+                        f"({self.verses_data.name} backend, {len(self.verses_data.columns)} columns)")
             
             # Verify required columns
-            required_columns = ['ayah_ar', 'ayah_en', 'surah_name_en', 'ayah_no_surah', 'surah_no']
-            missing_columns = [col for col in required_columns if col not in self.verses_data.columns]
+            missing_columns = [col for col in projected_columns if col not in self.verses_data.columns]
             if missing_columns:
                 raise ValueError(f"Missing required columns: {missing_columns}")
+            
+            # Verse bodies are rendered once per dataset version and translation set, not once per post
+            self.render_caches = {
+                translations: RenderCache(self.csv_file_path, self.verses_data, self.parse_mode, translations)
+                for translations in translation_sets
+            }
+            self.render_cache = self.render_caches.get(self.translations) or self.render_caches[translation_sets[0]]
+            
+            # The surah/ayah lookup and search indexes are only loaded when first needed
+            self._verse_index = None
+            self._search_index = None
+            self._morphology_index = None
+            self.response_cache.clear()
                 
         except Exception as e:
             logger.error(f"❌ Error loading dataset: {e}")
             raise
     
-    def load_state_from_github(self):
-        """Load state from GitHub repository using API"""
+    def get_verse(self, index: int):
+        """Fetch a single verse row by position"""
+        return self.verses_data.row(index)
+    
+    @property
+    def verse_index(self):
+        """(surah, ayah) -> row index, loaded on first use so scheduled posts never pay for it"""
+        if self._verse_index is None:
+            self._verse_index = load_verse_index(self.csv_file_path)
+        return self._verse_index
+    
+    @property
+    def search_index(self):
+        """BM25 index over the Arabic text and the loaded translations, loaded on first use"""
+        if self._search_index is None:
+            columns = ['ayah_ar'] + [column for translations in self.render_caches
+                                     for column in translations]
+            self._search_index = load_search_index(self.csv_file_path, self.verses_data,
+                                                   list(dict.fromkeys(columns)))
+        return self._search_index
+    
+    @property
+    def morphology_index(self):
+        """Memory-mapped root/lemma index, or None when it has not been built for this dataset"""
+        if self._morphology_index is None:
+            path = morphology_path_for(self.csv_file_path)
+            if not os.path.exists(path):
+                return None
+            index = MorphologyIndex(path)
+            if not index.matches_source(self.csv_file_path):
+                logger.warning(f"⚠️ {path} is out of date, rebuild it with morphology_index.py")
+                index.close()
+                return None
+            self._morphology_index = index
+        return self._morphology_index
+    
+    def search_verses(self, query: str, limit: int = MAX_SEARCH_RESULTS) -> list:
+        """Dataset positions of the best matches for a free-text query (Arabic or translation)"""
+        return [index for index, _ in self.search_index.search(query, limit)]
+    
+    def find_verses(self, reference: str) -> list:
+        """Dataset positions for a reference such as '2:255' or '2:255-257'
+        (raises KeyError/ValueError for unknown or malformed references)"""
+        return self.verse_index.resolve(reference)
+    
+    def create_state_store(self, state_backend: str):
+        """Build the configured state backend (github, file or sqlite)"""
+        if state_backend == 'github':
+            return GitHubStateStore(self.http, self.github_api_url, os.getenv('GITHUB_TOKEN'),
+                                    os.getenv('GITHUB_REPOSITORY'), self.state_file)
+        if state_backend == 'sqlite':
+            return SqliteStateStore(os.getenv('STATE_DB', 'bot_state.db'))
+        if state_backend == 'file':
+            return FileStateStore(self.state_file)
+        raise ValueError(f"Unknown state backend '{state_backend}', choose from {sorted(STATE_BACKENDS)}")
+    
+    def load_state(self):
+        """Load state from the configured state store"""
         try:
-            github_token = os.getenv('GITHUB_TOKEN')
-            repo = os.getenv('GITHUB_REPOSITORY')
-            
-            if not github_token or not repo:
-                logger.info("📝 GitHub credentials not available, starting from beginning")
-                self.current_index = 0
-                return
-            
-            # Try to get the state file from GitHub
-            url = f"https://api.github.com/repos/{repo}/contents/{self.state_file}"
-            headers = {
-                'Authorization': f'token {github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            response = requests.get(url, headers=headers)
+            state = self.state_store.load()
             
-            if response.status_code == 200:
-                # File exists, decode and load
-                content = response.json()
-                file_content = base64.b64decode(content['content']).decode('utf-8')
-                state = json.loads(file_content)
+            if state:
                 self.current_index = state.get('current_index', 0)
-                logger.info(f"📂 Loaded state from GitHub: current_index = {self.current_index}")
+                self.cycle = state.get('cycle', 0)
+                self.last_run = state.get('last_run')
+                self.bot_identity = state.get('bot_identity')
+                logger.info(f"📂 Loaded state ({self.state_store.name}): current_index = {self.current_index}")
             else:
-                # File doesn't exist, start from beginning
-                logger.info("📝 No previous state found in GitHub, starting from beginning")
+                # Nothing stored yet, start from beginning
+                logger.info("📝 No previous state found, starting from beginning")
                 self.current_index = 0
                 
         except Exception as e:
-            logger.error(f"⚠️ Error loading state from GitHub: {e}")
+            logger.error(f"⚠️ Error loading state: {e}")
             self.current_index = 0
     
-    def save_state_locally(self):
-        """Save state to local file (will be committed by GitHub Actions)"""
+    def save_state(self):
+        """Persist state to the configured state store"""
+        # Resident (daemon) bots count missed slots from this, not from the state loaded at startup
+        self.last_run = datetime.now(timezone.utc).isoformat()
         try:
             state = {
                 'current_index': self.current_index,
-                'last_run': datetime.now().isoformat(),
+                'cycle': self.cycle,
+                'last_run': self.last_run,
                 'total_verses': len(self.verses_data) if self.verses_data is not None else 0
             }
+            if self.bot_identity:
+                state['bot_identity'] = self.bot_identity
             
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            self.state_store.save(state)
             
-            logger.info(f"💾 Saved state locally: current_index = {self.current_index}")
+            logger.info(f"💾 Saved state ({self.state_store.name}): current_index = {self.current_index}")
             
         except Exception as e:
             logger.error(f"❌ Error saving state: {e}")
@@ -103,31 +228,8 @@ class GitHubActionsQuranBot:
     def format_verse_message(self, verse_row) -> str:
         """Format a verse into a beautiful message for Telegram"""
         try:
-            arabic_text = verse_row['ayah_ar']
-            english_text = verse_row['ayah_en']
-            surah_name = verse_row['surah_name_en']
-            surah_no = int(verse_row['surah_no'])
-            ayah_no = int(verse_row['ayah_no_surah'])
-            
-            # Calculate progress
-            progress = ((self.current_index + 1) / len(self.verses_data)) * 100
-            
-            message = f"""🕌 *Verse of the Hour* 🕌
-
-📖 *{surah_name}* ({surah_no}:{ayah_no})
-
-🔸 *Arabic:*
-{arabic_text}
-
-🔸 *English:*
-{english_text}
-
-─────────────────
-✨ May this verse bring peace and guidance to your heart ✨
-
-📊 Progress: {self.current_index + 1}/{len(self.verses_data)} ({progress:.1f}%)
-
-#Quran #Verse #Islam #Guidance #AutomatedByGitHub"""
+            message = (render_verse_body(verse_row, self.parse_mode, self.render_cache.translations)
+                       + render_footer(self.current_index + 1, len(self.verses_data), self.parse_mode))
             
             return message
             
@@ -135,47 +237,178 @@ class GitHubActionsQuranBot:
             logger.error(f"❌ Error formatting message: {e}")
             return None
     
-    def send_message(self, message: str) -> bool:
-        """Send a message to the Telegram channel"""
+    def render_verse_message(self, index: int, translations: tuple = None) -> str:
+        """Look up the pre-rendered verse and attach the current progress footer"""
+        try:
+            cache = self.render_caches[translations] if translations else self.render_cache
+            return cache.message(index)
+        except Exception as e:
+            logger.error(f"❌ Error formatting message: {e}")
+            return None
+    
+    def send_message(self, message: str, chat_id: str = None) -> bool:
+        """Send a message to a Telegram chat (the main channel by default)"""
+        return self.deliver_message(message, chat_id) is not None
+    
+    def deliver_message(self, message: str, chat_id: str = None):
+        """Send a message and return Telegram's message_id, or None on failure"""
+        chat_id = chat_id or self.channel_id
+        try:
+            return self.deliver_chunks(message, chat_id)
+        except DeliveryInDoubt as e:
+            logger.warning(f"⚠️ Delivery to {chat_id} is in doubt: {e}")
+            return None
+    
+    def deliver_chunks(self, message: str, chat_id: str):
+        """Send a message and return Telegram's message_id, or None when nothing was delivered
+        
+        Messages over Telegram's length limit go out as consecutive chunks over the
+        same keep-alive connection; the first chunk's message_id is returned. Raises
+        DeliveryInDoubt when some or all of the message may have reached the chat.
+        """
+        try:
+            chunks = split_message(message)
+        except Exception as e:
+            logger.error(f"❌ Error sending message: {e}")
+            return None
+        
+        message_ids = []
+        for chunk in chunks:
+            # All sends share one scheduler so fan-outs stay inside flood limits
+            message_id = self.outbound.send(chat_id, lambda: self.post_message(chunk, chat_id))
+            if not message_id:
+                if message_ids:
+                    # Retrying would repeat the chunks that did arrive
+                    raise DeliveryInDoubt(f"only {len(message_ids)}/{len(chunks)} chunks reached {chat_id}")
+                return None
+            message_ids.append(message_id)
+        
+        if len(chunks) > 1:
+            logger.info(f"✂️ Sent long message to {chat_id} in {len(chunks)} chunks")
+        return message_ids[0] if message_ids else None
+    
+    def post_message(self, message: str, chat_id: str):
+        """Perform one sendMessage call; returns the message_id (False on a definite failure),
+        raises RetryAfter on HTTP 429 and DeliveryInDoubt when Telegram may have got it"""
         try:
+            # Catch markup Telegram would reject before paying for the round-trip
+            validate(message, self.parse_mode)
+            
             url = f"{self.base_url}/sendMessage"
             payload = {
-                'chat_id': self.channel_id,
+                'chat_id': chat_id,
                 'text': message,
-                'parse_mode': 'Markdown',
+                'parse_mode': self.parse_mode,
                 'disable_web_page_preview': True
             }
             
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.http.post(url, json=payload, timeout=30)
+            
+            if response.status_code == 429:
+                retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                raise RetryAfter(retry_after)
             
             if response.status_code == 200:
                 result = response.json()
                 if result.get('ok'):
                     logger.info("✅ Message sent successfully to Telegram")
-                    return True
+                    return result['result']['message_id']
                 else:
                     error_desc = result.get('description', 'Unknown error')
                     logger.error(f"❌ Telegram API error: {error_desc}")
                     return False
-            else:
+            elif 400 <= response.status_code < 500:
                 logger.error(f"❌ HTTP error: {response.status_code} - {response.text}")
                 return False
+            else:
+                # A 5xx may come from a proxy after Telegram accepted the message
+                raise DeliveryInDoubt(f"HTTP {response.status_code} - {response.text}")
                 
+        except (RetryAfter, DeliveryInDoubt):
+            raise
+        except MessageFormatError as e:
+            logger.error(f"❌ Message rejected before sending ({self.parse_mode}): {e}")
+            return False
         except Exception as e:
-            logger.error(f"❌ Error sending message: {e}")
+            if request_not_sent(e):
+                logger.error(f"❌ Error sending message: {e}")
+                return False
+            # Timeouts, resets and unreadable replies can follow a delivered message
+            raise DeliveryInDoubt(f"{type(e).__name__}: {e}") from e
+    
+    def send_verse(self, message: str, chat_id: str) -> bool:
+        """Send the current verse to one chat at most once, guarded by the journal"""
+        if self.journal is None:
+            return self.send_message(message, chat_id)
+        
+        status = self.journal.claim(self.cycle, self.current_index, chat_id)
+        if status == CONFIRMED:
+            logger.info(f"↩️ Verse {self.current_index + 1} already delivered to {chat_id}, skipping")
+            return True
+        if status == PENDING:
+            # An earlier attempt may or may not have reached Telegram; never risk a duplicate
+            logger.warning(f"⚠️ Verse {self.current_index + 1} delivery to {chat_id} is in doubt, not resending")
+            return True
+        
+        try:
+            message_id = self.deliver_chunks(message, chat_id)
+        except DeliveryInDoubt as e:
+            # Counted as posted: the claim stays pending and the run moves on, so neither a
+            # retry of this run nor the next one can repeat a message that may have arrived
+            logger.warning(f"⚠️ Verse {self.current_index + 1} delivery to {chat_id} is in doubt, "
+                           f"treating it as posted: {e}")
+            return True
+        if message_id is None:
+            self.journal.release(self.cycle, self.current_index, chat_id)
             return False
+        self.journal.confirm(self.cycle, self.current_index, chat_id, message_id)
+        return True
+    
+    def broadcast_message(self, message: str, send=None, chat_ids=None):
+        """Deliver one message to every registered channel (or the given ones) concurrently"""
+        send = send or self.send_message
+        sender = FanoutSender(lambda chat_id, text: send(text, chat_id), self.fanout_concurrency)
+        report = sender.deliver(message, list(self.channels if chat_ids is None else chat_ids))
+        
+        logger.info(f"📡 Fan-out: {report.summary()}")
+        for chat_id, error in report.failed.items():
+            logger.error(f"❌ Delivery to {chat_id} failed: {error}")
+        return report
+    
+    def publish_message(self, message: str, chat_ids=None) -> bool:
+        """Send to the single channel, or fan out when several are registered"""
+        chat_ids = list(self.channels if chat_ids is None else chat_ids)
+        if len(chat_ids) <= 1:
+            return self.send_verse(message, chat_ids[0] if chat_ids else self.channel_id)
+        return bool(self.broadcast_message(message, self.send_verse, chat_ids).succeeded)
+    
+    def publish_verse(self, index: int) -> bool:
+        """Render the verse once per translation set and publish it to the matching chats"""
+        published = False
+        for translations, chat_ids in self.channels.groups(self.translations).items():
+            message = self.render_verse_message(index, translations)
+            if not message:
+                logger.error(f"❌ Failed to format message for {', '.join(translations)}")
+                continue
+            published = self.publish_message(message, chat_ids) or published
+        return published
     
     def test_telegram_connection(self) -> bool:
         """Test if the bot can connect to Telegram"""
         try:
             url = f"{self.base_url}/getMe"
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             
             if response.status_code == 200:
                 result = response.json()
                 if result.get('ok'):
                     bot_info = result['result']
                     logger.info(f"🤖 Bot connected: @{bot_info.get('username', 'unknown')}")
+                    self.bot_identity = {
+                        'id': bot_info.get('id'),
+                        'username': bot_info.get('username'),
+                        'checked_at': datetime.now().isoformat()
+                    }
                     return True
             
             logger.error("❌ Failed to connect to Telegram bot")
@@ -185,81 +418,363 @@ class GitHubActionsQuranBot:
             logger.error(f"❌ Error testing Telegram connection: {e}")
             return False
     
-    def post_single_verse(self) -> bool:
+    def has_fresh_identity(self) -> bool:
+        """Whether a cached getMe result for this token is younger than the TTL"""
+        try:
+            identity = self.bot_identity or {}
+            # Bot tokens look like '<bot id>:<secret>', so a new token invalidates the cache
+            if str(identity.get('id')) != self.bot_token.split(':', 1)[0]:
+                return False
+            age = datetime.now() - datetime.fromisoformat(identity['checked_at'])
+            return age.total_seconds() < self.identity_ttl
+        except (KeyError, TypeError, ValueError):
+            return False
+    
+    def ensure_telegram_connection(self) -> bool:
+        """Probe getMe only when the probe mode and identity cache require it"""
+        if self.probe_mode == 'optimistic':
+            return True
+        if self.probe_mode == 'cached' and self.has_fresh_identity():
+            logger.info(f"🤖 Using cached bot identity: @{self.bot_identity.get('username', 'unknown')}")
+            return True
+        return self.test_telegram_connection()
+    
+    def missed_slots(self, now: datetime = None, capped: bool = True) -> int:
+        """Scheduled slots since the last run, including the one this run is for
+        
+        Capped at CATCHUP_MAX + 1 unless capped is False, which counts every slot
+        """
+        try:
+            last_run = datetime.fromisoformat(self.last_run)
+        except (TypeError, ValueError):
+            return 1
+        if last_run.tzinfo is None:
+            # Older state files stored naive timestamps; runners use UTC
+            last_run = last_run.replace(tzinfo=timezone.utc)
+        
+        now = now or datetime.now(timezone.utc)
+        limit = max(self.catchup_max, 1) + 1 if capped else float('inf')
+        return max(len(self.schedule.slots_between(last_run, now, limit)), 1)
+    
+    def post_due_verses(self) -> bool:
+        """Post this run's verse plus any missed ones, according to the catch-up policy"""
+        if self.catchup_policy == 'off':
+            return self.post_single_verse()
+        
+        # skip has to match the calendar however long the outage, so it counts every slot
+        due = self.missed_slots(capped=self.catchup_policy != 'skip')
+        if due > 1:
+            logger.info(f"⏱️ {due - 1} scheduled run(s) were missed since {self.last_run}")
+        
+        if self.catchup_policy == 'skip':
+            # Stay aligned with the calendar: jump over the missed verses, post one.
+            # The jump is undone if the post fails; the next run recomputes it from last_run
+            position = (self.current_index, self.cycle)
+            skipped = self.current_index + due - 1
+            self.cycle += skipped // len(self.verses_data)
+            self.current_index = skipped % len(self.verses_data)
+            if self.post_single_verse():
+                return True
+            self.current_index, self.cycle = position
+            return False
+        
+        if self.catchup_policy != 'burst':
+            raise ValueError(f"Unknown catch-up policy '{self.catchup_policy}'")
+        
+        # One process posts the whole backlog; the outbound scheduler paces the burst
+        # and state is saved once at the end (the journal covers a crash midway)
+        posts = min(due, max(self.catchup_max, 1))
+        posted = 0
+        for _ in range(posts):
+            if not self.post_single_verse(save=False):
+                break
+            posted += 1
+        
+        if posted:
+            self.save_state()
+        logger.info(f"📚 Catch-up posted {posted}/{posts} verse(s)")
+        return posted == posts
+    
+    def post_single_verse(self, save: bool = True) -> bool:
         """Post a single verse and update state"""
         try:
             if self.verses_data is None or len(self.verses_data) == 0:
                 logger.error("❌ No verses data available")
                 return False
             
-            # Test Telegram connection first
-            if not self.test_telegram_connection():
+            # Test Telegram connection first (skipped while the cached identity is fresh)
+            if not self.ensure_telegram_connection():
                 return False
             
             # Get the current verse
             if self.current_index >= len(self.verses_data):
                 self.current_index = 0  # Reset to beginning
+                self.cycle += 1
                 logger.info("🔄 Reached end of dataset, restarting from beginning")
             
-            current_verse = self.verses_data.iloc[self.current_index]
-            
-            # Format the message
-            message = self.format_verse_message(current_verse)
-            if not message:
-                logger.error("❌ Failed to format message")
-                return False
-            
-            # Send the message
-            if self.send_message(message):
-                surah_name = current_verse['surah_name_en']
-                surah_no = current_verse['surah_no']
-                ayah_no = current_verse['ayah_no_surah']
+            # Format and send the message (one rendering per translation set)
+            if self.publish_verse(self.current_index):
+                reference = self.render_cache.entry(self.current_index)['reference']
                 
                 logger.info(f"📤 Posted verse {self.current_index + 1}/{len(self.verses_data)}: "
-                           f"{surah_name} {surah_no}:{ayah_no}")
+                           f"{reference}")
                 
                 # Move to next verse and save state
                 self.current_index += 1
-                self.save_state_locally()
+                if save:
+                    self.save_state()
                 return True
             else:
                 logger.error("❌ Failed to send message to Telegram")
+                if self.probe_mode == 'optimistic':
+                    # No probe was made up front, so check the bot itself now
+                    self.test_telegram_connection()
                 return False
                 
         except Exception as e:
             logger.error(f"❌ Error posting verse: {e}")
             return False
+    
+    def command_reply(self, update: dict):
+        """(chat_id, reply) for a command update, or None for anything else"""
+        message = update.get('message') or {}
+        text = message.get('text') or ''
+        if not text.startswith('/'):
+            return None
+        
+        reply = self.answer_command(text)
+        if reply is None:
+            reply = escape("Unknown command, send /help for the list", self.parse_mode)
+        return str(message['chat']['id']), reply
+    
+    def handle_update(self, update: dict):
+        """Answer a command sent to the bot (called by the interactive update loop)"""
+        answer = self.command_reply(update)
+        if answer:
+            chat_id, reply = answer
+            self.deliver_message(reply, chat_id)
+    
+    def webhook_reply(self, update: dict):
+        """Answer a webhook update; returns a sendMessage call to put in the webhook
+        response, or None when there is nothing to send inline
+        
+        Only one call fits in the response and Telegram reports nothing back, so a reply
+        goes inline only when it is a single valid message; longer ones are sent normally.
+        """
+        answer = self.command_reply(update)
+        if not answer:
+            return None
+        chat_id, reply = answer
+        
+        if len(split_message(reply)) > 1:
+            self.deliver_message(reply, chat_id)
+            return None
+        try:
+            validate(reply, self.parse_mode)
+        except MessageFormatError as e:
+            logger.error(f"❌ Reply rejected before sending ({self.parse_mode}): {e}")
+            return None
+        
+        # Inline replies still count against Telegram's limits, so they pass the same gate
+        return self.outbound.send(chat_id, lambda: {
+            'method': 'sendMessage',
+            'chat_id': chat_id,
+            'text': reply,
+            'parse_mode': self.parse_mode,
+            'disable_web_page_preview': True
+        })
+    
+    def set_webhook(self, url: str, secret_token: str, max_connections: int = 40) -> bool:
+        """Register the webhook URL and secret token with Telegram"""
+        try:
+            payload = {
+                'url': url,
+                'secret_token': secret_token,
+                'allowed_updates': ['message'],
+                'max_connections': max_connections
+            }
+            response = self.http.post(f"{self.base_url}/setWebhook", json=payload, timeout=30)
+            result = response.json() if response.status_code == 200 else {}
+            if result.get('ok'):
+                logger.info(f"🔗 Webhook set to {url}")
+                return True
+            logger.error(f"❌ setWebhook failed: {response.status_code} - {response.text}")
+            return False
+        except Exception as e:
+            logger.error(f"❌ Error setting webhook: {e}")
+            return False
+    
+    def answer_command(self, text: str):
+        """Reply for a /command from the in-memory dataset, or None if it is not one of ours"""
+        command, _, argument = text.strip().partition(' ')
+        # In groups commands may be addressed as /verse@SomeBot
+        command = command.split('@', 1)[0].lower()
+        handlers = {
+            '/start': self.command_help,
+            '/help': self.command_help,
+            '/verse': self.command_verse,
+            '/random': self.command_random,
+            '/surah': self.command_surah,
+            '/search': self.command_search,
+            '/root': self.command_root,
+            '/lemma': self.command_lemma,
+        }
+        handler = handlers.get(command)
+        if handler is None:
+            return None
+        
+        argument = ' '.join(argument.split())
+        if command == '/random':
+            return self.run_command(handler, argument)
+        # Repeated queries skip the index lookups and rendering entirely
+        key = (f"{command} {argument}", self.render_cache.translations, self.parse_mode)
+        return self.run_command(handler, argument, key)
+    
+    def run_command(self, handler, argument: str, cache_key=None) -> str:
+        """Run a handler; with a cache_key its reply is cached, error replies never are"""
+        try:
+            if cache_key is None:
+                return handler(argument)
+            # A raising handler stores nothing, so a transient failure is not replayed
+            return self.response_cache.get_or_compute(cache_key, lambda: handler(argument))
+        except (KeyError, ValueError) as e:
+            reason = e.args[0] if e.args else str(e)
+            return f"❌ {escape(reason, self.parse_mode)}"
+    
+    def command_help(self, argument: str) -> str:
+        return escape("🕌 Quran Bot commands:\n\n"
+                      "/verse 2:255 - a verse, or a range such as 2:255-257\n"
+                      "/random - a random verse\n"
+                      "/surah 36 - the opening verses of a surah\n"
+                      "/search mercy - verses matching words in Arabic or a translation\n"
+                      "/root رحم - verses using an Arabic root (/lemma for a lemma)", self.parse_mode)
+    
+    def command_verse(self, argument: str) -> str:
+        if not argument:
+            raise ValueError("Usage: /verse 2:255")
+        return self.render_verses(self.find_verses(argument))
+    
+    def command_random(self, argument: str) -> str:
+        return self.render_verses([random.randrange(len(self.verses_data))])
+    
+    def command_surah(self, argument: str) -> str:
+        try:
+            surah = int(argument)
+        except ValueError:
+            raise ValueError("Usage: /surah 36") from None
+        
+        rows = self.verse_index.surah_rows(surah)
+        reply = self.render_verses(rows[:MAX_VERSES_PER_REPLY])
+        if len(rows) > MAX_VERSES_PER_REPLY:
+            more = (f"➕ {len(rows) - MAX_VERSES_PER_REPLY} more: /verse {surah}:{MAX_VERSES_PER_REPLY + 1}-"
+                    f"{min(len(rows), 2 * MAX_VERSES_PER_REPLY)}")
+            reply += '\n\n' + escape(more, self.parse_mode)
+        return reply
+    
+    def command_search(self, argument: str) -> str:
+        if not argument:
+            raise ValueError("Usage: /search mercy")
+        
+        indexes = self.search_verses(argument)
+        if not indexes:
+            return escape(f"🔎 No verses found for \"{argument}\"", self.parse_mode)
+        column = self.render_cache.translations[0]
+        hits = [render_search_hit(self.get_verse(index), self.parse_mode, column) for index in indexes]
+        return escape(f"🔎 Results for \"{argument}\":", self.parse_mode) + '\n\n' + '\n\n'.join(hits)
+    
+    def command_root(self, argument: str) -> str:
+        return self.morphology_reply('root', argument)
+    
+    def command_lemma(self, argument: str) -> str:
+        return self.morphology_reply('lemma', argument)
+    
+    def morphology_reply(self, kind: str, argument: str) -> str:
+        if not argument:
+            raise ValueError(f"Usage: /{kind} رحم (Arabic letters or Buckwalter)")
+        index = self.morphology_index
+        if index is None:
+            raise ValueError("Root and lemma search is not available for this dataset")
+        
+        indexes = index.root(argument) if kind == 'root' else index.lemma(argument)
+        if not indexes:
+            return escape(f"🔎 No verses found for the {kind} \"{argument}\"", self.parse_mode)
+        column = self.render_cache.translations[0]
+        hits = [render_search_hit(self.get_verse(i), self.parse_mode, column)
+                for i in indexes[:MAX_SEARCH_RESULTS]]
+        header = escape(f"🌱 {len(indexes)} verse(s) use the {kind} \"{argument}\":", self.parse_mode)
+        return header + '\n\n' + '\n\n'.join(hits)
+    
+    def render_verses(self, indexes: list) -> str:
+        """Verse cards for an on-demand reply"""
+        if len(indexes) > MAX_VERSES_PER_REPLY:
+            raise ValueError(f"At most {MAX_VERSES_PER_REPLY} verses per request")
+        translations = self.render_cache.translations
+        return '\n\n'.join(render_verse_card(self.get_verse(index), self.parse_mode, translations)
+                           for index in indexes)
 
-def main():
-    """Main function - posts one verse then exits"""
+def load_config():
+    """Read and validate configuration from environment variables"""
     
-    logger.info("🚀 Starting GitHub Actions Quran Bot...")
+    config = {
+        'bot_token': os.getenv("BOT_TOKEN"),
+        'channel_id': os.getenv("CHANNEL_ID"),
+        'csv_file_path': "quran_dataset.csv",
+        'dataset_backend': os.getenv("DATASET_BACKEND", "auto"),
+        'fanout_concurrency': int(os.getenv("FANOUT_CONCURRENCY", "16")),
+        'global_rate': float(os.getenv("TELEGRAM_GLOBAL_RATE", str(GLOBAL_RATE))),
+        'probe_mode': os.getenv("TELEGRAM_PROBE", "cached"),
+        'identity_ttl': int(os.getenv("BOT_IDENTITY_TTL", str(24 * 3600))),
+        'telegram_api_url': os.getenv("TELEGRAM_API_URL", TELEGRAM_API),
+        'github_api_url': os.getenv("GITHUB_API_URL", GITHUB_API),
+        'state_backend': os.getenv("STATE_BACKEND", "github"),
+        'journal_path': os.getenv("POST_JOURNAL", "post_journal.db"),
+        'post_schedule': os.getenv("POST_SCHEDULE", "0 * * * *"),
+        'catchup_policy': os.getenv("CATCHUP_POLICY", "off"),
+        'catchup_max': int(os.getenv("CATCHUP_MAX", "24")),
+        'parse_mode': os.getenv("PARSE_MODE", "Markdown"),
+        'translations': os.getenv("TRANSLATIONS", "en"),
+        'response_cache_entries': int(os.getenv("RESPONSE_CACHE_ENTRIES", "1024")),
+        'response_cache_bytes': int(os.getenv("RESPONSE_CACHE_BYTES", str(4 * 1024 * 1024))),
+        'response_cache_ttl': float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+    }
     
-    # Get configuration from environment variables
-    BOT_TOKEN = os.getenv("BOT_TOKEN")
-    CHANNEL_ID = os.getenv("CHANNEL_ID")
-    CSV_FILE_PATH = "quran_dataset.csv"
+    # Extra chats to fan out to: CHANNEL_IDS="id1,id2" and/or a channels.json list
+    config['channels'] = ChannelRegistry.from_sources(
+        config['channel_id'], os.getenv("CHANNEL_IDS"), os.getenv("CHANNELS_FILE", "channels.json"))
     
     # Validate configuration
-    if not BOT_TOKEN:
+    if not config['bot_token']:
         logger.error("❌ BOT_TOKEN environment variable not set")
         logger.info("💡 Add your bot token to GitHub repository secrets")
-        return False
+        return None
     
-    if not CHANNEL_ID:
+    if not config['channel_id']:
         logger.error("❌ CHANNEL_ID environment variable not set")
         logger.info("💡 Add your channel ID to GitHub repository secrets")
-        return False
+        return None
     
-    if not os.path.exists(CSV_FILE_PATH):
-        logger.error(f"❌ CSV file not found: {CSV_FILE_PATH}")
+    if not os.path.exists(config['csv_file_path']):
+        logger.error(f"❌ CSV file not found: {config['csv_file_path']}")
         logger.info("💡 Make sure to upload your quran_dataset.csv file to the repository")
+        return None
+    
+    return config
+
+def main():
+    """Main function - posts one verse then exits"""
+    
+    logger.info("🚀 Starting GitHub Actions Quran Bot...")
+    
+    config = load_config()
+    if config is None:
         return False
     
     # Create and run the bot
+    bot = None
     try:
-        bot = GitHubActionsQuranBot(BOT_TOKEN, CHANNEL_ID, CSV_FILE_PATH)
-        success = bot.post_single_verse()
+        bot = GitHubActionsQuranBot(**config)
+        success = bot.post_due_verses()
+        bot.http.log_stats()
         
         if success:
             logger.info("✅ Verse posted successfully! 🎉")
@@ -271,7 +786,103 @@ def main():
     except Exception as e:
         logger.error(f"💥 Bot crashed: {e}")
         return False
+    finally:
+        # Checkpoint the WAL into post_journal.db, the only file the workflow caches
+        if bot is not None and bot.journal is not None:
+            bot.journal.close()
+
+def run_daemon():
+    """Daemon mode - keeps the bot resident and posts on POST_SCHEDULE (cron, UTC)"""
+    
+    logger.info("🚀 Starting Quran Bot in daemon mode...")
+    
+    config = load_config()
+    if config is None:
+        return False
+    
+    try:
+        # Dataset, state and connections stay in memory between posts
+        bot = GitHubActionsQuranBot(**config)
+        scheduler = Scheduler(bot.schedule, bot.post_due_verses)
+        scheduler.install_signal_handlers()
+        
+        logger.info(f"🗓️ Posting on schedule '{bot.schedule.expression}'")
+        scheduler.run()
+        bot.http.log_stats()
+        return True
+        
+    except Exception as e:
+        logger.error(f"💥 Daemon crashed: {e}")
+        return False
+
+def run_interactive():
+    """Interactive mode - answers /verse, /random and /surah via getUpdates long-polling"""
+    
+    logger.info("🚀 Starting Quran Bot in interactive mode...")
+    
+    config = load_config()
+    if config is None:
+        return False
+    
+    try:
+        # Replies are served from the resident dataset; only the reply itself hits the network
+        bot = GitHubActionsQuranBot(**config)
+        poller = UpdatePoller(bot.http, bot.base_url, int(os.getenv("POLL_TIMEOUT", str(POLL_TIMEOUT))))
+        engine = UpdateEngine(poller.fetch, bot.handle_update, int(os.getenv("UPDATE_WORKERS", "8")))
+        engine.install_signal_handlers()
+        
+        logger.info(f"💬 Listening for commands with {engine.workers} workers")
+        engine.run()
+        bot.response_cache.log_stats()
+        bot.http.log_stats()
+        return True
+        
+    except Exception as e:
+        logger.error(f"💥 Interactive mode crashed: {e}")
+        return False
+
+def run_webhook():
+    """Webhook mode - receives updates over HTTPS instead of polling for them"""
+    
+    logger.info("🚀 Starting Quran Bot in webhook mode...")
+    
+    config = load_config()
+    if config is None:
+        return False
+    
+    secret_token = os.getenv("WEBHOOK_SECRET")
+    if not secret_token:
+        logger.error("❌ WEBHOOK_SECRET environment variable not set")
+        return False
+    
+    try:
+        bot = GitHubActionsQuranBot(**config)
+        server = WebhookServer(bot.webhook_reply, secret_token,
+                               path=os.getenv("WEBHOOK_PATH", "/webhook"),
+                               host=os.getenv("WEBHOOK_HOST", "0.0.0.0"),
+                               port=int(os.getenv("WEBHOOK_PORT", "8443")),
+                               workers=int(os.getenv("UPDATE_WORKERS", "8")))
+        
+        # Register with Telegram when the public URL is known (e.g. behind a TLS proxy)
+        webhook_url = os.getenv("WEBHOOK_URL")
+        if webhook_url and not bot.set_webhook(webhook_url, secret_token):
+            return False
+        
+        server.install_signal_handlers()
+        server.run()
+        bot.response_cache.log_stats()
+        bot.http.log_stats()
+        return True
+        
+    except Exception as e:
+        logger.error(f"💥 Webhook server crashed: {e}")
+        return False
 
 if __name__ == "__main__":
-    success = main()
+    if "--webhook" in sys.argv[1:]:
+        success = run_webhook()
+    elif "--interactive" in sys.argv[1:]:
+        success = run_interactive()
+    else:
+        success = run_daemon() if "--daemon" in sys.argv[1:] else main()
     exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+HTTP Session - Shared keep-alive connection pools for Telegram and GitHub calls
+Each API host gets its own pool so a busy fan-out cannot starve state requests
+"""
+
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API = "https://api.telegram.org"
+GITHUB_API = "https://api.github.com"
+
+# (connect, read) seconds, used when a call does not pass its own timeout
+DEFAULT_TIMEOUT = (5, 30)
+
+
+def request_not_sent(error: Exception) -> bool:
+    """Whether a failed call never reached the server (no connection could be opened)
+
+    Read timeouts and resets can happen after the server processed the request,
+    so only connect failures count as definitely not sent.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests so connection reuse can be reported"""
+
+    def __init__(self, *args, **kwargs):
+        self.requests_sent = 0
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        self.requests_sent += 1
+        return super().send(request, **kwargs)
+
+    def connections_opened(self) -> int:
+        """Connections created by every pool this adapter manages"""
+        pools = self.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+
+class HttpClient:
+    """requests.Session wrapper with one pooled adapter per API host"""
+
+    def __init__(self, pool_size: int = 10, timeout=DEFAULT_TIMEOUT,
+                 hosts=(TELEGRAM_API, GITHUB_API)):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.adapters = {}
+        for host in hosts:
+            adapter = CountingAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self.session.mount(host, adapter)
+            self.adapters[host] = adapter
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PUT', url, **kwargs)
+
+    def stats(self) -> dict:
+        """Per-host request and connection counts"""
+        stats = {}
+        for host, adapter in self.adapters.items():
+            opened = adapter.connections_opened()
+            stats[host] = {
+                'requests': adapter.requests_sent,
+                'connections': opened,
+                'reused': max(adapter.requests_sent - opened, 0),
+            }
+        return stats
+
+    def log_stats(self):
+        for host, s in self.stats().items():
+            if s['requests']:
+                logger.info(f"🔌 {host}: {s['requests']} requests over "
+                            f"{s['connections']} connections ({s['reused']} reused)")
+
+    def close(self):
+        self.session.close()
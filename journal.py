@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Post Journal - Write-ahead record of every verse delivery, for exactly-once posting
+An intent row is claimed before sendMessage and confirmed with the Telegram
+message_id afterwards, so a restarted or retried run never posts the same verse twice.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLAIMED = 'claimed'      # this caller owns the delivery and should send
+PENDING = 'pending'      # another attempt claimed it and its outcome is unknown
+CONFIRMED = 'confirmed'  # already delivered
+
+
+class DeliveryInDoubt(Exception):
+    """Raised when a send failed in a way that may still have delivered (part of) the message"""
+
+
+class PostJournal:
+    """SQLite (WAL) journal keyed by (cycle, verse_index, chat_id)
+
+    The cycle number distinguishes passes through the dataset, since the index wraps
+    back to 0 after the last verse. Writes are local, so the happy path gains no
+    network round-trip.
+    """
+
+    def __init__(self, path: str = "post_journal.db", max_age_days: int = 30):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                cycle INTEGER NOT NULL,
+                verse_index INTEGER NOT NULL,
+                chat_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                message_id INTEGER,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (cycle, verse_index, chat_id)
+            )
+        """)
+        self.prune(max_age_days)
+
+    def claim(self, cycle: int, verse_index: int, chat_id) -> str:
+        """Record the intent to send; returns CLAIMED, PENDING or CONFIRMED"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO deliveries (cycle, verse_index, chat_id, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cycle, verse_index, str(chat_id), PENDING, time.time()))
+            if cursor.rowcount == 1:
+                return CLAIMED
+            (status,) = self.conn.execute(
+                "SELECT status FROM deliveries WHERE cycle = ? AND verse_index = ? AND chat_id = ?",
+                (cycle, verse_index, str(chat_id))).fetchone()
+            return status
+
+    def confirm(self, cycle: int, verse_index: int, chat_id, message_id):
+        """Mark a claimed delivery as sent and keep Telegram's message_id"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE deliveries SET status = ?, message_id = ?, updated_at = ? "
+                "WHERE cycle = ? AND verse_index = ? AND chat_id = ?",
+                (CONFIRMED, message_id, time.time(), cycle, verse_index, str(chat_id)))
+
+    def release(self, cycle: int, verse_index: int, chat_id):
+        """Drop a claim whose send definitely failed, so a later attempt may retry"""
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM deliveries WHERE cycle = ? AND verse_index = ? AND chat_id = ? "
+                "AND status = ?",
+                (cycle, verse_index, str(chat_id), PENDING))
+
+    def message_id(self, cycle: int, verse_index: int, chat_id):
+        """Telegram message_id of a confirmed delivery, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT message_id FROM deliveries WHERE cycle = ? AND verse_index = ? "
+                "AND chat_id = ? AND status = ?",
+                (cycle, verse_index, str(chat_id), CONFIRMED)).fetchone()
+        return row[0] if row else None
+
+    def prune(self, max_age_days: int):
+        """Forget deliveries older than any plausible retry window"""
+        with self._lock:
+            self.conn.execute("DELETE FROM deliveries WHERE updated_at < ?",
+                              (time.time() - max_age_days * 86400,))
+
+    def close(self):
+        self.conn.close()
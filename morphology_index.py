@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Morphology Index - Arabic root and lemma -> verse lookups
+Built offline from a Quranic Arabic Corpus morphology file (Buckwalter or Arabic
+script), so no morphology toolkit is needed at runtime. Each root and lemma keeps
+a sorted posting list of verse positions, delta + varint encoded, and the file is
+memory-mapped: a lookup is a binary search over the mapped key directory.
+
+Build it once next to the dataset:
+    python morphology_index.py quran_dataset.csv quranic-corpus-morphology.txt
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+
+from search_index import normalize_arabic
+from verse_index import load_verse_index
+from verse_store import file_sha256, matches_source
+
+logger = logging.getLogger(__name__)
+
+MORPHOLOGY_MAGIC = b'QMX1'
+MORPHOLOGY_VERSION = 1
+MORPHOLOGY_EXTENSION = '.qmx'
+
+ROOT = b'R'
+LEMMA = b'L'
+
+# magic, version, number of keys, source CSV size, SHA-256 of the source CSV
+_HEADER = struct.Struct('<4sHIQ32s')
+_U32 = struct.Struct('<I')
+
+# Buckwalter transliteration used by the Quranic Arabic Corpus
+_BUCKWALTER = str.maketrans({
+    "'": 'ء', '|': 'آ', '>': 'أ', '&': 'ؤ', '<': 'إ', '}': 'ئ', 'A': 'ا', 'b': 'ب',
+    'p': 'ة', 't': 'ت', 'v': 'ث', 'j': 'ج', 'H': 'ح', 'x': 'خ', 'd': 'د', '*': 'ذ',
+    'r': 'ر', 'z': 'ز', 's': 'س', '$': 'ش', 'S': 'ص', 'D': 'ض', 'T': 'ط', 'Z': 'ظ',
+    'E': 'ع', 'g': 'غ', '_': 'ـ', 'f': 'ف', 'q': 'ق', 'k': 'ك', 'l': 'ل', 'm': 'م',
+    'n': 'ن', 'h': 'ه', 'w': 'و', 'Y': 'ى', 'y': 'ي', 'F': 'ً', 'N': 'ٌ', 'K': 'ٍ',
+    'a': 'َ', 'u': 'ُ', 'i': 'ِ', '~': 'ّ', 'o': 'ْ', '`': 'ٰ', '{': 'ٱ', '^': 'ٓ',
+})
+_ARABIC_SCRIPT = re.compile('[\u0600-\u06FF]')
+_LOCATION = re.compile(r'^\(?(\d+):(\d+):')
+
+
+def morphology_path_for(csv_file_path: str) -> str:
+    """Return the morphology index path that sits next to a CSV dataset"""
+    return os.path.splitext(csv_file_path)[0] + MORPHOLOGY_EXTENSION
+
+
+def normalize_key(text: str) -> str:
+    """Arabic or Buckwalter root/lemma -> normalized Arabic letters without spaces"""
+    text = text.strip()
+    if not _ARABIC_SCRIPT.search(text):
+        text = text.translate(_BUCKWALTER)
+    return normalize_arabic(text).replace(' ', '')
+
+
+def encode_postings(positions) -> bytes:
+    """Sorted, distinct positions -> gaps encoded as LEB128 varints"""
+    out = bytearray()
+    previous = 0
+    for position in positions:
+        gap = position - previous
+        previous = position
+        while gap >= 0x80:
+            out.append((gap & 0x7F) | 0x80)
+            gap >>= 7
+        out.append(gap)
+    return bytes(out)
+
+
+def decode_postings(buffer, offset: int, count: int) -> list:
+    """Inverse of encode_postings for count entries starting at offset"""
+    positions = []
+    previous = 0
+    for _ in range(count):
+        gap = shift = 0
+        while True:
+            byte = buffer[offset]
+            offset += 1
+            gap |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        previous += gap
+        positions.append(previous)
+    return positions
+
+
+def parse_morphology(morphology_file_path: str):
+    """Yield (surah, ayah, root, lemma) per segment of a corpus morphology file
+
+    Accepts the classic '(1:1:1:2)<TAB>FORM<TAB>TAG<TAB>FEATURES' layout and the newer
+    '1:1:1:2' one; root and lemma come from the ROOT: and LEM: features.
+    """
+    with open(morphology_file_path, encoding='utf-8-sig') as f:
+        for line in f:
+            fields = line.rstrip('\r\n').split('\t')
+            match = _LOCATION.match(fields[0])
+            if not match or len(fields) < 2:
+                continue
+            root = lemma = None
+            for feature in fields[-1].split('|'):
+                if feature.startswith('ROOT:'):
+                    root = feature[5:]
+                elif feature.startswith('LEM:'):
+                    lemma = feature[4:]
+            if root or lemma:
+                yield int(match.group(1)), int(match.group(2)), root, lemma
+
+
+def build_morphology_index(csv_file_path: str, morphology_file_path: str,
+                           output_path: str = None) -> str:
+    """Map every root and lemma to the dataset positions of the verses using it"""
+    output_path = output_path or morphology_path_for(csv_file_path)
+    verse_index = load_verse_index(csv_file_path)
+
+    postings = {}
+    unknown = 0
+    for surah, ayah, root, lemma in parse_morphology(morphology_file_path):
+        try:
+            position = verse_index.lookup(surah, ayah)
+        except KeyError:
+            unknown += 1
+            continue
+        for kind, value in ((ROOT, root), (LEMMA, lemma)):
+            if value:
+                postings.setdefault(kind + normalize_key(value).encode('utf-8'), set()).add(position)
+    if unknown:
+        logger.warning(f"⚠️ {unknown} morphology segments refer to verses missing from the dataset")
+
+    keys = sorted(postings)
+    key_offsets, posting_offsets, counts = [0], [0], []
+    key_blob, posting_blob = bytearray(), bytearray()
+    for key in keys:
+        positions = sorted(postings[key])
+        key_blob += key
+        posting_blob += encode_postings(positions)
+        key_offsets.append(len(key_blob))
+        posting_offsets.append(len(posting_blob))
+        counts.append(len(positions))
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write(_HEADER.pack(MORPHOLOGY_MAGIC, MORPHOLOGY_VERSION, len(keys),
+                               os.path.getsize(csv_file_path), file_sha256(csv_file_path)))
+        for values in (key_offsets, posting_offsets, counts):
+            out.write(struct.pack(f'<{len(values)}I', *values))
+        out.write(key_blob)
+        out.write(posting_blob)
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"✅ Indexed {sum(k[:1] == ROOT for k in keys)} roots and "
+                f"{sum(k[:1] == LEMMA for k in keys)} lemmas into {output_path} "
+                f"({len(posting_blob)} bytes of postings)")
+    return output_path
+
+
+class MorphologyIndex:
+    """Memory-mapped reader; nothing but the header is read until a lookup"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, version, nkeys, source_size, source_sha = _HEADER.unpack_from(self._map, 0)
+        if magic != MORPHOLOGY_MAGIC or version != MORPHOLOGY_VERSION:
+            self.close()
+            raise ValueError(f"Not a morphology index (or unsupported version): {path}")
+
+        self.source_size = source_size
+        self.source_sha256 = source_sha
+        self._nkeys = nkeys
+        self._key_offsets = _HEADER.size
+        self._posting_offsets = self._key_offsets + (nkeys + 1) * _U32.size
+        self._counts = self._posting_offsets + (nkeys + 1) * _U32.size
+        self._key_blob = self._counts + nkeys * _U32.size
+        self._posting_blob = self._key_blob + self._u32(self._key_offsets, nkeys)
+
+    def _u32(self, table: int, i: int) -> int:
+        return _U32.unpack_from(self._map, table + i * _U32.size)[0]
+
+    def _key(self, i: int) -> bytes:
+        start = self._key_blob + self._u32(self._key_offsets, i)
+        return self._map[start:self._key_blob + self._u32(self._key_offsets, i + 1)]
+
+    def __len__(self) -> int:
+        return self._nkeys
+
+    def matches_source(self, csv_file_path: str) -> bool:
+        """Check the index was built from this CSV"""
+        return matches_source(csv_file_path, self.source_size, self.source_sha256)
+
+    def lookup(self, kind: bytes, value: str) -> list:
+        """Sorted dataset positions for a root (kind=ROOT) or lemma (kind=LEMMA)"""
+        key = kind + normalize_key(value).encode('utf-8')
+        low, high = 0, self._nkeys
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._nkeys or self._key(low) != key:
+            return []
+        return decode_postings(self._map, self._posting_blob + self._u32(self._posting_offsets, low),
+                               self._u32(self._counts, low))
+
+    def root(self, value: str) -> list:
+        return self.lookup(ROOT, value)
+
+    def lemma(self, value: str) -> list:
+        return self.lookup(LEMMA, value)
+
+    def close(self):
+        """Release the memory map and file handle"""
+        self._map.close()
+        self._file.close()
+
+
+def main():
+    """Build the morphology index from the files given on the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) < 3:
+        logger.error("❌ Usage: python morphology_index.py quran_dataset.csv <morphology file> [output]")
+        return False
+    try:
+        build_morphology_index(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error building morphology index: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Keeps outbound Telegram traffic inside the Bot API flood limits
+A global token bucket plus one bucket per chat; HTTP 429 replies pause and retry
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Telegram's documented limits: ~30 messages/second overall, 1/second per private
+# chat and 20/minute per group or channel
+GLOBAL_RATE = 30.0
+PRIVATE_CHAT_RATE = 1.0
+GROUP_CHAT_RATE = 20.0 / 60.0
+
+# Resident modes see one chat per user; buckets idle this long after refilling are dropped
+CHAT_BUCKET_IDLE_SECONDS = 300.0
+
+
+class RetryAfter(Exception):
+    """Raised by a sender when Telegram answers 429 with a retry_after hint"""
+
+    def __init__(self, seconds: float):
+        super().__init__(f"Flood control, retry after {seconds}s")
+        self.seconds = seconds
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of blocking"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def block_for(self, seconds: float):
+        """Hold back every reservation for the next few seconds (after a 429)"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def is_idle(self, now: float, idle_seconds: float) -> bool:
+        """Full, not blocked and unused for idle_seconds, i.e. the same as a new bucket"""
+        with self._lock:
+            refilled_at = self.updated + (self.capacity - self.tokens) / self.rate
+            return self.blocked_until <= now and now - refilled_at >= idle_seconds
+
+
+def chat_rate(chat_id) -> float:
+    """Per-chat limit: groups/channels have negative ids or @usernames"""
+    chat_id = str(chat_id)
+    return GROUP_CHAT_RATE if chat_id.startswith(('-', '@')) else PRIVATE_CHAT_RATE
+
+
+class OutboundScheduler:
+    """Central gate every sendMessage passes through"""
+
+    def __init__(self, global_rate: float = GLOBAL_RATE, max_retries: int = 5,
+                 sleep=time.sleep, idle_seconds: float = CHAT_BUCKET_IDLE_SECONDS):
+        self.global_bucket = TokenBucket(global_rate, capacity=global_rate)
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.idle_seconds = idle_seconds
+        self._chat_buckets = {}
+        self._next_prune = time.monotonic() + idle_seconds
+        self._lock = threading.Lock()
+
+    def prune(self, now: float = None) -> int:
+        """Drop idle per-chat buckets; returns how many were dropped"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [chat_id for chat_id, bucket in self._chat_buckets.items()
+                    if bucket.is_idle(now, self.idle_seconds)]
+            for chat_id in idle:
+                del self._chat_buckets[chat_id]
+            self._next_prune = now + self.idle_seconds
+        return len(idle)
+
+    def chat_bucket(self, chat_id) -> TokenBucket:
+        if time.monotonic() >= self._next_prune:
+            self.prune()
+        with self._lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = self._chat_buckets[chat_id] = TokenBucket(chat_rate(chat_id))
+            return bucket
+
+    def send(self, chat_id, send_func):
+        """Run send_func once both buckets allow it, requeueing on 429 replies"""
+        chat_bucket = self.chat_bucket(chat_id)
+
+        for attempt in range(self.max_retries + 1):
+            # Wait for the chat first so a slow chat does not hold a global slot
+            for bucket in (chat_bucket, self.global_bucket):
+                wait = bucket.reserve()
+                if wait > 0:
+                    self.sleep(wait)
+
+            try:
+                return send_func()
+            except RetryAfter as e:
+                chat_bucket.block_for(e.seconds)
+                if attempt == self.max_retries:
+                    break
+                logger.warning(f"⏳ Rate limited on {chat_id}, retrying in {e.seconds}s "
+                               f"(retry {attempt + 1}/{self.max_retries})")
+
+        logger.error(f"❌ Giving up on {chat_id} after {self.max_retries} rate-limit retries")
+        return False
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Render Cache - Pre-rendered verse messages
+Everything but the progress footer is fixed per verse, so it is rendered once per
+dataset version and stitched together with the footer at send time.
+
+Build the persisted cache next to the dataset (optional, it is filled lazily otherwise):
+    python render_cache.py quran_dataset.csv [Markdown|MarkdownV2|HTML] [en,ur,...]
+"""
+
+import logging
+import os
+import sys
+
+from dataset_backends import open_dataset
+from escaping import bold, escape
+from translations import DEFAULT_TRANSLATIONS, language_code, parse_translations, translation_label
+from verse_store import VerseStore, write_store
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the message template changes so old cache files are ignored
+RENDER_VERSION = 2
+
+
+def render_cache_path_for(csv_file_path: str, parse_mode: str = 'Markdown',
+                          translations: tuple = DEFAULT_TRANSLATIONS) -> str:
+    """Return the pre-rendered cache path for a dataset, template version, parse mode
+    and translation selection"""
+    variant = parse_mode.lower()
+    if tuple(translations) != DEFAULT_TRANSLATIONS:
+        variant += '-' + '-'.join(language_code(column) for column in translations)
+    return f"{os.path.splitext(csv_file_path)[0]}.render-v{RENDER_VERSION}-{variant}.qvs"
+
+
+def verse_reference(verse_row) -> str:
+    """Short human reference such as 'Al-Baqarah 2:255'"""
+    return f"{verse_row['surah_name_en']} {int(verse_row['surah_no'])}:{int(verse_row['ayah_no_surah'])}"
+
+
+def render_translations(verse_row, parse_mode: str = 'Markdown',
+                        translations: tuple = DEFAULT_TRANSLATIONS) -> str:
+    """One labelled section per translation column, each followed by a blank line"""
+    return ''.join(
+        f"🔸 {bold(translation_label(column) + ':', parse_mode)}\n{escape(verse_row[column], parse_mode)}\n\n"
+        for column in translations
+    )
+
+
+def render_verse_card(verse_row, parse_mode: str = 'Markdown',
+                      translations: tuple = DEFAULT_TRANSLATIONS) -> str:
+    """Compact rendering for on-demand replies: reference, Arabic text and translations"""
+    surah_name = bold(verse_row['surah_name_en'], parse_mode)
+    reference = escape(f"({int(verse_row['surah_no'])}:{int(verse_row['ayah_no_surah'])})", parse_mode)
+    arabic_text = escape(verse_row['ayah_ar'], parse_mode)
+    sections = render_translations(verse_row, parse_mode, translations)
+    return f"📖 {surah_name} {reference}\n\n{arabic_text}\n\n{sections}".rstrip('\n')
+
+
+def render_search_hit(verse_row, parse_mode: str = 'Markdown', column: str = 'ayah_en',
+                      snippet_length: int = 160) -> str:
+    """One search result: reference, surah name and the start of the matched text"""
+    text = str(verse_row[column])
+    if len(text) > snippet_length:
+        text = text[:snippet_length].rsplit(' ', 1)[0] + '…'
+    reference = bold(f"{int(verse_row['surah_no'])}:{int(verse_row['ayah_no_surah'])}", parse_mode)
+    return f"📖 {reference} {escape(verse_row['surah_name_en'], parse_mode)}\n{escape(text, parse_mode)}"
+
+
+def render_verse_body(verse_row, parse_mode: str = 'Markdown',
+                      translations: tuple = DEFAULT_TRANSLATIONS) -> str:
+    """Render the per-verse part of the message (everything above the progress line)
+
+    Every literal and dataset value is escaped for parse_mode, so characters such
+    as '*', '_' or '[' in a translation can no longer break the message.
+    """
+    arabic_text = escape(verse_row['ayah_ar'], parse_mode)
+    sections = render_translations(verse_row, parse_mode, translations)
+    surah_name = bold(verse_row['surah_name_en'], parse_mode)
+    reference = escape(f"({int(verse_row['surah_no'])}:{int(verse_row['ayah_no_surah'])})", parse_mode)
+    blessing = escape("May this verse bring peace and guidance to your heart", parse_mode)
+
+    return f"""🕌 {bold('Verse of the Hour', parse_mode)} 🕌
+
+📖 {surah_name} {reference}
+
+🔸 {bold('Arabic:', parse_mode)}
+{arabic_text}
+
+{sections}─────────────────
+✨ {blessing} ✨
+
+"""
+
+
+def render_footer(position: int, total: int, parse_mode: str = 'Markdown') -> str:
+    """Render the progress footer for the 1-based position in the dataset"""
+    progress = (position / total) * 100
+    progress_line = escape(f"Progress: {position}/{total} ({progress:.1f}%)", parse_mode)
+    hashtags = escape("#Quran #Verse #Islam #Guidance #AutomatedByGitHub", parse_mode)
+    return f"""📊 {progress_line}
+
+{hashtags}"""
+
+
+class RenderCache:
+    """Verse index -> {'reference', 'body'}, backed by a persisted cache when available"""
+
+    def __init__(self, csv_file_path: str, dataset, parse_mode: str = 'Markdown',
+                 translations: tuple = DEFAULT_TRANSLATIONS):
+        self.dataset = dataset
+        self.parse_mode = parse_mode
+        self.translations = tuple(translations)
+        self._memo = {}
+        self._store = None
+
+        path = render_cache_path_for(csv_file_path, parse_mode, self.translations)
+        if os.path.exists(path):
+            store = VerseStore(path)
+            if store.matches_source(csv_file_path) and len(store) == len(dataset):
+                self._store = store
+                logger.info(f"🗂️ Using pre-rendered messages from {path}")
+            else:
+                logger.warning(f"⚠️ {path} is out of date, rendering on demand")
+                store.close()
+
+    def entry(self, index: int) -> dict:
+        """Rendered body and reference for one verse"""
+        cached = self._memo.get(index)
+        if cached is None:
+            if self._store is not None:
+                cached = self._store.row(index)
+            else:
+                verse_row = self.dataset.row(index)
+                cached = {'reference': verse_reference(verse_row),
+                          'body': render_verse_body(verse_row, self.parse_mode, self.translations)}
+            self._memo[index] = cached
+        return cached
+
+    def message(self, index: int) -> str:
+        """Full message for a verse: cached body plus a fresh progress footer"""
+        return self.entry(index)['body'] + render_footer(index + 1, len(self.dataset), self.parse_mode)
+
+
+def build_render_cache(csv_file_path: str, dataset=None, parse_mode: str = 'Markdown',
+                       translations: tuple = DEFAULT_TRANSLATIONS) -> str:
+    """Render every verse once and persist the result next to the dataset"""
+    if dataset is None:
+        dataset = open_dataset(csv_file_path)
+    path = render_cache_path_for(csv_file_path, parse_mode, translations)
+    records = (
+        (verse_reference(row), render_verse_body(row, parse_mode, translations))
+        for row in (dataset.row(i) for i in range(len(dataset)))
+    )
+    rows = write_store(path, ['reference', 'body'], records, csv_file_path)
+    logger.info(f"🗂️ Pre-rendered {rows} verse messages into {path}")
+    return path
+
+
+def main():
+    """Build the render cache for the dataset given on the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    csv_file_path = sys.argv[1] if len(sys.argv) > 1 else "quran_dataset.csv"
+    parse_mode = sys.argv[2] if len(sys.argv) > 2 else "Markdown"
+    translations = parse_translations(sys.argv[3] if len(sys.argv) > 3 else None)
+    try:
+        build_render_cache(csv_file_path, parse_mode=parse_mode, translations=translations)
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error building render cache: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Response Cache - Bounded LRU/TTL cache for rendered command replies
+Popular requests (Ayat al-Kursi, Al-Fatiha, common search terms) are answered
+from memory, skipping index lookups and rendering. Entries are evicted by count,
+by total size and by age.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Thread-safe LRU keyed by (query, language, format); values are reply strings"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 4 * 1024 * 1024,
+                 ttl: float = 3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Cached value, or None on a miss (expired entries count as misses)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._drop(key)
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value: str):
+        size = len(value.encode('utf-8'))
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, self.clock() + self.ttl)
+            self.size_bytes += size
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value or compute, store and return it"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.size_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def log_stats(self):
+        stats = self.stats()
+        logger.info(f"🗃️ Response cache: {stats['hits']} hits, {stats['misses']} misses "
+                    f"({stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes']} bytes, "
+                    f"{stats['evictions']} evicted")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Scheduler - In-process cron-style scheduling for the resident daemon mode
+Understands the same five-field expressions as the GitHub Actions schedule
+"""
+
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+# (low, high) bounds for minute, hour, day of month, month, day of week
+_FIELD_BOUNDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(field: str, low: int, high: int) -> set:
+    """Expand one cron field ('*', '5', '1-5', '*/15', '0,30') into its values"""
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {field}")
+
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field '{field}' outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Five-field cron expression evaluated in UTC, like GitHub Actions"""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: '{expression}'")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_BOUNDS)
+        )
+        # Both 0 and 7 mean Sunday
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        # Standard cron: when both day fields are restricted, either one may match
+        if not self._any_day and not self._any_weekday:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def matches(self, dt: datetime) -> bool:
+        """Whether the schedule fires during the minute containing dt"""
+        return (dt.minute in self.minutes and dt.hour in self.hours
+                and dt.month in self.months and self._day_matches(dt))
+
+    def next_after(self, dt: datetime) -> datetime:
+        """First firing time strictly after dt"""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1,
+                                              day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+    def slots_between(self, start: datetime, end: datetime, limit: int = 10000) -> list:
+        """Firing times in (start, end], oldest first, at most limit of them"""
+        slots = []
+        fire_at = self.next_after(start)
+        while fire_at <= end and len(slots) < limit:
+            slots.append(fire_at)
+            fire_at = self.next_after(fire_at)
+        return slots
+
+
+class Scheduler:
+    """Runs a job every time a cron schedule fires until stopped"""
+
+    def __init__(self, schedule: CronSchedule, job):
+        self.schedule = schedule
+        self.job = job
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        """Ask the loop to exit; safe to use as a signal handler"""
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        """Stop cleanly on SIGINT/SIGTERM (e.g. systemd or docker stop)"""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    def run(self, now=None):
+        """Sleep until each firing time and run the job; returns when stopped"""
+        now = now or (lambda: datetime.now(timezone.utc))
+
+        while not self._stop.is_set():
+            fire_at = self.schedule.next_after(now())
+            logger.info(f"⏰ Next run at {fire_at.isoformat()}")
+
+            # Sleep in one wait; stop() wakes it immediately
+            if self._stop.wait(max((fire_at - now()).total_seconds(), 0)):
+                break
+
+            try:
+                self.job()
+            except Exception as e:
+                logger.error(f"❌ Scheduled job failed: {e}")
+
+        logger.info("🛑 Scheduler stopped")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Search Index - BM25-ranked full-text search over the Arabic text and translations
+Arabic is normalized (tashkeel and Quranic marks stripped, alef/ya/ta-marbuta
+unified) and English is stemmed, so "mercies" finds "mercy" and a diacritized
+query finds the bare spelling. The inverted index is persisted as a compact binary
+artifact next to the dataset, so startup loads arrays instead of re-tokenizing.
+
+Build the artifact (optional, it is built on first use otherwise):
+    python search_index.py quran_dataset.csv [ayah_ar,ayah_en,...]
+"""
+
+import array
+import heapq
+import logging
+import math
+import os
+import re
+import struct
+import sys
+
+from dataset_backends import open_dataset
+from verse_store import file_sha256
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MAGIC = b'QSX1'
+SEARCH_EXTENSION = '.qsx'
+
+# Bump when tokenization changes so persisted indexes are rebuilt
+ANALYZER_VERSION = 2
+
+DEFAULT_SEARCH_COLUMNS = ('ayah_ar', 'ayah_en')
+
+# magic, analyzer version, documents, terms, postings, SHA-256 of the source CSV
+_SEARCH_HEADER = struct.Struct('<4sHIII32s')
+_BLOB_LENGTH = struct.Struct('<I')
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+# Harakat, superscript alef, Quranic annotation marks and tatweel
+_ARABIC_MARKS = re.compile('[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]')
+_ARABIC_LETTERS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ی': 'ي', 'ئ': 'ي',
+    'ة': 'ه',
+    'ؤ': 'و',
+})
+_ARABIC_SCRIPT = re.compile('[\u0600-\u06FF]')
+_WORD = re.compile(r"\w+")
+
+_ENGLISH_STOPWORDS = frozenset("""
+a an and are as at be but by for from had has have he her him his i if in into is it its
+me my not o of on or our shall she so that the their them then there they this those to
+was we were what when which who will with would ye you your
+""".split())
+
+# Longest suffix first; the stem must keep at least three letters
+_ENGLISH_SUFFIXES = (
+    ('ational', 'ate'), ('fulness', 'ful'), ('iveness', 'ive'), ('ousness', 'ous'),
+    ('ements', ''), ('ement', ''), ('ments', ''), ('ment', ''), ('ness', ''),
+    ('ings', ''), ('ing', ''), ('edly', ''), ('sses', 'ss'), ('ies', 'y'), ('ied', 'y'),
+    ('ed', ''), ('ly', ''), ("'s", ''), ('s', ''),
+)
+
+
+def search_index_path_for(csv_file_path: str) -> str:
+    """Return the search index path that sits next to a CSV dataset"""
+    return os.path.splitext(csv_file_path)[0] + SEARCH_EXTENSION
+
+
+def normalize_arabic(text: str) -> str:
+    """Strip diacritics and unify letter variants that readers treat as the same"""
+    return _ARABIC_MARKS.sub('', text).translate(_ARABIC_LETTERS)
+
+
+def stem_english(word: str) -> str:
+    """Light suffix-stripping stemmer (plural, -ing, -ed, -ly, -ness, -ment, final e)"""
+    if len(word) <= 3:
+        return word
+    for suffix, replacement in _ENGLISH_SUFFIXES:
+        # A double s is not a plural: grass stays grass, but kindness still loses -ness
+        if suffix == 's' and word.endswith('ss'):
+            break
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    # believe/believed/believing all become 'believ'
+    if len(word) > 4 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+
+def basic_terms(text: str) -> list:
+    """Lower-cased word tokens with Arabic-script normalization (Arabic, Urdu, ...)"""
+    return _WORD.findall(normalize_arabic(str(text)).lower())
+
+
+def english_terms(text: str) -> list:
+    return [stem_english(word) for word in basic_terms(text) if word not in _ENGLISH_STOPWORDS]
+
+
+def document_terms(text: str, column: str) -> list:
+    """Analyzer used at index time for one column"""
+    return english_terms(text) if column == 'ayah_en' else basic_terms(text)
+
+
+def query_terms(query: str) -> list:
+    """Analyzer used at query time; a Latin query matches stemmed English and other languages"""
+    terms = []
+    candidates = basic_terms(query)
+    if not _ARABIC_SCRIPT.search(query):
+        candidates += english_terms(query)
+    for term in candidates:
+        if term not in terms and term not in _ENGLISH_STOPWORDS:
+            terms.append(term)
+    return terms
+
+
+class SearchIndex:
+    """Inverted index: sorted vocabulary, per-term posting ranges and verse lengths"""
+
+    def __init__(self, columns, terms: list, offsets: array.array, documents: array.array,
+                 frequencies: array.array, lengths: array.array):
+        self.columns = tuple(columns)
+        self.terms = terms
+        self._term_ids = {term: i for i, term in enumerate(terms)}
+        self.offsets = offsets
+        self.documents = documents
+        self.frequencies = frequencies
+        self.lengths = lengths
+        self.average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    @classmethod
+    def build(cls, dataset, columns=DEFAULT_SEARCH_COLUMNS) -> 'SearchIndex':
+        """Tokenize every verse once; document ids are dataset row positions"""
+        columns = [column for column in columns if column in dataset.columns]
+        postings = {}
+        lengths = array.array('I')
+        for row_number in range(len(dataset)):
+            row = dataset.row(row_number)
+            counts = {}
+            for column in columns:
+                for term in document_terms(row[column], column):
+                    counts[term] = counts.get(term, 0) + 1
+            lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                postings.setdefault(term, []).append((row_number, min(count, 0xFFFF)))
+
+        terms = sorted(postings)
+        offsets = array.array('I', [0])
+        documents = array.array('I')
+        frequencies = array.array('H')
+        for term in terms:
+            for row_number, count in postings[term]:
+                documents.append(row_number)
+                frequencies.append(count)
+            offsets.append(len(documents))
+        return cls(columns, terms, offsets, documents, frequencies, lengths)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """[(row position, BM25 score)] best first"""
+        total = len(self.lengths)
+        if not total:
+            return []
+        scores = {}
+        for term in query_terms(query):
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            frequency = end - start
+            idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for i in range(start, end):
+                document = self.documents[i]
+                tf = self.frequencies[i]
+                norm = K1 * (1 - B + B * self.lengths[document] / self.average_length)
+                scores[document] = scores.get(document, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        # Equal scores keep canonical order
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def save(self, path: str, source_sha: bytes):
+        columns_blob = ','.join(self.columns).encode('utf-8')
+        terms_blob = '\n'.join(self.terms).encode('utf-8')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as out:
+            out.write(_SEARCH_HEADER.pack(SEARCH_MAGIC, ANALYZER_VERSION, len(self.lengths),
+                                          len(self.terms), len(self.documents), source_sha))
+            for blob in (columns_blob, terms_blob):
+                out.write(_BLOB_LENGTH.pack(len(blob)))
+                out.write(blob)
+            for values in (self.lengths, self.offsets, self.documents, self.frequencies):
+                out.write(values.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, source_sha: bytes, columns):
+        """Read a saved index, or return None if it is missing, corrupt, stale or
+        built over different columns"""
+        try:
+            with open(path, 'rb') as f:
+                magic, version, ndocs, nterms, npostings, indexed_sha = _SEARCH_HEADER.unpack(
+                    f.read(_SEARCH_HEADER.size))
+                if magic != SEARCH_MAGIC or version != ANALYZER_VERSION or indexed_sha != source_sha:
+                    return None
+                blobs = []
+                for _ in range(2):
+                    (length,) = _BLOB_LENGTH.unpack(f.read(_BLOB_LENGTH.size))
+                    blobs.append(f.read(length).decode('utf-8'))
+                indexed_columns = tuple(blobs[0].split(',')) if blobs[0] else ()
+                if indexed_columns != tuple(columns):
+                    return None
+
+                arrays = []
+                for typecode, count in (('I', ndocs), ('I', nterms + 1), ('I', npostings), ('H', npostings)):
+                    values = array.array(typecode)
+                    values.frombytes(f.read(count * values.itemsize))
+                    if len(values) != count:
+                        return None
+                    arrays.append(values)
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+
+        lengths, offsets, documents, frequencies = arrays
+        terms = blobs[1].split('\n') if nterms else []
+        return cls(indexed_columns, terms, offsets, documents, frequencies, lengths)
+
+
+def load_search_index(csv_file_path: str, dataset=None, columns=DEFAULT_SEARCH_COLUMNS) -> SearchIndex:
+    """Load the persisted index, rebuilding it when the CSV or the column set changed"""
+    index_file_path = search_index_path_for(csv_file_path)
+    source_sha = file_sha256(csv_file_path)
+    if dataset is None:
+        dataset = open_dataset(csv_file_path, columns=columns)
+    columns = tuple(column for column in columns if column in dataset.columns)
+
+    index = SearchIndex.load(index_file_path, source_sha, columns)
+    if index is not None:
+        return index
+
+    logger.info(f"📝 Building search index over {', '.join(columns)}")
+    index = SearchIndex.build(dataset, columns)
+    try:
+        index.save(index_file_path, source_sha)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write {index_file_path}, keeping the index in memory: {e}")
+    return index
+
+
+def main():
+    """Build the search index for the dataset given on the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    csv_file_path = sys.argv[1] if len(sys.argv) > 1 else "quran_dataset.csv"
+    columns = tuple(sys.argv[2].split(',')) if len(sys.argv) > 2 else DEFAULT_SEARCH_COLUMNS
+    try:
+        index = load_search_index(csv_file_path, columns=columns)
+        logger.info(f"✅ Indexed {len(index)} verses, {len(index.terms)} terms, "
+                    f"{len(index.documents)} postings")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error building search index: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+State Store - Pluggable persistence for the bot state (current_index etc.)
+Backends: an atomic local JSON file, SQLite in WAL mode, and the GitHub repository
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """Common interface: load() returns the state dict or None, save() persists it"""
+
+    name = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self, state: dict):
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the store"""
+
+
+class FileStateStore(StateStore):
+    """JSON file replaced atomically (write temp, fsync, rename) so it is never torn"""
+
+    name = 'file'
+
+    def __init__(self, path: str = "bot_state.json"):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state: dict):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        # Make the rename itself durable
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class SqliteStateStore(StateStore):
+    """Key/value table in a WAL-mode SQLite database; one row per state field"""
+
+    name = 'sqlite'
+
+    def __init__(self, path: str = "bot_state.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS bot_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def load(self):
+        rows = self.conn.execute("SELECT key, value FROM bot_state").fetchall()
+        return {key: json.loads(value) for key, value in rows} or None
+
+    def save(self, state: dict):
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                "INSERT INTO bot_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                [(key, json.dumps(value)) for key, value in state.items()])
+
+    def close(self):
+        self.conn.close()
+
+
+def git_blob_sha(path: str):
+    """SHA-1 git gives the file as a blob (the contents API 'sha'), or None if unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+class GitHubStateStore(StateStore):
+    """Keeps bot_state.json in the repository through the contents API
+
+    The blob SHA and state from the last GET or our own PUT are kept in cache_path.
+    If the checked-out bot_state.json is still that blob the cached state is used with
+    no request at all; otherwise a known ETag makes the GET conditional, so an unchanged
+    state costs a body-less 304. Saves are a single PUT guarded by the blob SHA, so two
+    concurrent runs cannot silently overwrite each other.
+    """
+
+    name = 'github'
+
+    def __init__(self, http, api_url: str, token: str, repo: str, path: str = "bot_state.json",
+                 cache_path: str = ".bot_state_cache.json", max_retries: int = 3):
+        self.http = http
+        self.api_url = api_url
+        self.token = token
+        self.repo = repo
+        self.path = path
+        self.max_retries = max_retries
+        self.local = FileStateStore(path)
+        self.cache = FileStateStore(cache_path) if cache_path else None
+        self.etag = None
+        self.sha = None
+        self._cached_state = None
+
+    @property
+    def url(self) -> str:
+        return f"{self.api_url}/repos/{self.repo}/contents/{self.path}"
+
+    def _headers(self) -> dict:
+        return {
+            'Authorization': f'token {self.token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+
+    def _load_cache(self):
+        if self.etag is not None or self.cache is None:
+            return
+        try:
+            cached = self.cache.load() or {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable state cache: {e}")
+            return
+        if (cached.get('etag') or cached.get('sha')) and 'state' in cached:
+            self.etag = cached['etag']
+            self.sha = cached.get('sha')
+            self._cached_state = cached['state']
+
+    def _store_cache(self):
+        if self.cache is None:
+            return
+        try:
+            self.cache.save({'etag': self.etag, 'sha': self.sha, 'state': self._cached_state})
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write state cache: {e}")
+
+    def load(self, conditional: bool = True):
+        if not self.token or not self.repo:
+            logger.info("📝 GitHub credentials not available")
+            return None
+
+        headers = self._headers()
+        if conditional:
+            self._load_cache()
+            if self.sha and self._cached_state is not None and git_blob_sha(self.path) == self.sha:
+                # The checkout is the commit we last read or wrote; a stale SHA would
+                # still be caught by the SHA-guarded PUT
+                logger.info("📂 Checked-out state matches the cached blob, skipping the fetch")
+                return self._cached_state
+            if self.etag:
+                headers['If-None-Match'] = self.etag
+
+        response = self.http.get(self.url, headers=headers)
+
+        if response.status_code == 304:
+            logger.info("📂 State unchanged on GitHub (304), using cached copy")
+            return self._cached_state
+        if response.status_code == 404:
+            self.sha = None
+            return None
+        if response.status_code != 200:
+            return None
+
+        content = response.json()
+        state = json.loads(base64.b64decode(content['content']).decode('utf-8'))
+        self.etag = response.headers.get('ETag')
+        self.sha = content.get('sha')
+        self._cached_state = state
+        self._store_cache()
+        return state
+
+    def resolve_conflict(self, ours: dict, theirs: dict):
+        """Pick what to write after a concurrent update; None keeps the remote copy"""
+        if theirs and theirs.get('current_index', 0) >= ours.get('current_index', 0):
+            return None
+        return ours
+
+    def save(self, state: dict):
+        # The local copy feeds the workflow summary and covers runs without credentials
+        self.local.save(state)
+        if not self.token or not self.repo:
+            return
+
+        for attempt in range(self.max_retries + 1):
+            content = json.dumps(state, indent=2).encode('utf-8')
+            payload = {
+                'message': f"🤖 Update bot state - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                'content': base64.b64encode(content).decode('ascii'),
+            }
+            if self.sha:
+                payload['sha'] = self.sha
+
+            response = self.http.put(self.url, headers=self._headers(), json=payload)
+
+            if response.status_code in (200, 201):
+                self.sha = response.json()['content']['sha']
+                self.etag = None
+                self._cached_state = state
+                self._store_cache()
+                return
+
+            if response.status_code not in (409, 422):
+                raise RuntimeError(f"GitHub state update failed: {response.status_code} - {response.text}")
+
+            # Someone else committed first: refresh the SHA and decide whether to retry
+            logger.warning(f"⚠️ State changed on GitHub while saving (attempt {attempt + 1}), refreshing")
+            theirs = self.load(conditional=False)
+            state = self.resolve_conflict(state, theirs)
+            if state is None:
+                logger.info("📂 Remote state is already ahead, keeping it")
+                # Keep the local copy (and the workflow summary) in step with what was committed
+                self.local.save(theirs)
+                return
+
+        raise RuntimeError(f"GitHub state update kept conflicting after {self.max_retries} retries")
+
+
+STATE_BACKENDS = {
+    backend.name: backend
+    for backend in (FileStateStore, SqliteStateStore, GitHubStateStore)
+}
@@ -0,0 +1,86 @@
+"""
+Shared fixtures: a small synthetic dataset and a bot wired to stubbed HTTP
+Nothing here touches the network or the repository's own state files
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from github_actions_bot import GitHubActionsQuranBot  # noqa: E402
+from rate_limiter import OutboundScheduler  # noqa: E402
+
+COLUMNS = ['surah_no', 'surah_name_en', 'surah_name_ar', 'ayah_no_surah', 'ayah_no_quran',
+           'ayah_ar', 'ayah_en', 'juz_no', 'hizb_quarter']
+
+
+def write_dataset(path, surah_lengths=(7, 5, 3)) -> str:
+    """CSV with one row per verse; surah n has surah_lengths[n - 1] verses"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        number = 0
+        for surah, length in enumerate(surah_lengths, 1):
+            for ayah in range(1, length + 1):
+                number += 1
+                writer.writerow([surah, f'Surah {surah}', 'سورة', ayah, number,
+                                 'بِسْمِ ٱللَّهِ', f'In the name of God, verse {surah}:{ayah}',
+                                 1 + number // 8, 1 + number // 4])
+    return str(path)
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload: dict):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+def sent(message_id: int) -> FakeResponse:
+    return FakeResponse(200, {'ok': True, 'result': {'message_id': message_id}})
+
+
+class FakeHttp:
+    """Stands in for HttpClient; each POST pops the next scripted response or exception"""
+
+    def __init__(self, script=()):
+        self.script = list(script)
+        self.posts = []
+
+    def post(self, url, json=None, **kwargs):
+        self.posts.append(json)
+        outcome = self.script.pop(0) if self.script else sent(len(self.posts))
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def dataset_csv(tmp_path):
+    return write_dataset(tmp_path / 'quran_dataset.csv')
+
+
+@pytest.fixture
+def make_bot(tmp_path, dataset_csv, monkeypatch):
+    """Factory for bots with file state and a journal under tmp_path"""
+    # The file state backend writes bot_state.json in the working directory
+    monkeypatch.chdir(tmp_path)
+
+    def make(script=(), **kwargs):
+        kwargs.setdefault('state_backend', 'file')
+        kwargs.setdefault('journal_path', str(tmp_path / 'post_journal.db'))
+        kwargs.setdefault('probe_mode', 'optimistic')
+        bot = GitHubActionsQuranBot('123:test', '@channel', dataset_csv, **kwargs)
+        bot.http = FakeHttp(script)
+        bot.outbound = OutboundScheduler(global_rate=1e9, sleep=lambda seconds: None)
+        return bot
+
+    return make
@@ -0,0 +1,88 @@
+"""Catch-up policies across consecutive runs of a resident (daemon) bot"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import github_actions_bot
+from conftest import FakeResponse
+
+START = datetime(2026, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+
+class Clock(datetime):
+    """datetime whose now() is set by the test"""
+
+    current = START
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current if tz else cls.current.replace(tzinfo=None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    Clock.current = START
+    monkeypatch.setattr(github_actions_bot, 'datetime', Clock)
+    return Clock
+
+
+@pytest.mark.parametrize('policy', ['burst', 'skip'])
+def test_hourly_daemon_ticks_post_one_verse_each(make_bot, clock, policy):
+    bot = make_bot(catchup_policy=policy)
+    bot.last_run = (START - timedelta(hours=1)).isoformat()
+
+    for tick in range(4):
+        clock.current = START + timedelta(hours=tick)
+        assert bot.post_due_verses()
+        assert bot.current_index == tick + 1
+        assert bot.last_run == clock.current.isoformat()
+
+    assert len(bot.http.posts) == 4
+    with open('bot_state.json', encoding='utf-8') as f:
+        assert json.load(f)['last_run'] == bot.last_run
+
+
+def test_burst_posts_missed_slots_once(make_bot, clock):
+    bot = make_bot(catchup_policy='burst', catchup_max=24)
+    bot.last_run = (START - timedelta(hours=3)).isoformat()
+
+    assert bot.post_due_verses()
+    assert bot.current_index == 3
+
+    clock.current = START + timedelta(hours=1)
+    assert bot.post_due_verses()
+    assert bot.current_index == 4
+
+
+def test_skip_jumps_over_missed_slots(make_bot, clock):
+    bot = make_bot(catchup_policy='skip')
+    bot.last_run = (START - timedelta(hours=3)).isoformat()
+
+    assert bot.post_due_verses()
+    # Verses 1 and 2 are skipped, verse 3 is posted
+    assert bot.current_index == 3
+    assert len(bot.http.posts) == 1
+
+
+def test_skip_after_failed_post_does_not_jump_twice(make_bot, clock):
+    bot = make_bot([FakeResponse(400, {'ok': False, 'description': 'Bad Request'})], catchup_policy='skip')
+    bot.last_run = (START - timedelta(hours=3)).isoformat()
+
+    assert not bot.post_due_verses()
+    assert bot.current_index == 0
+
+    clock.current = START + timedelta(hours=1)
+    assert bot.post_due_verses()
+    # Four slots since last_run: three skipped, the fourth posted
+    assert bot.current_index == 4
+
+
+def test_skip_is_not_capped_by_catchup_max(make_bot, clock):
+    bot = make_bot(catchup_policy='skip', catchup_max=2)
+    bot.last_run = (START - timedelta(hours=20)).isoformat()
+
+    assert bot.post_due_verses()
+    # 19 verses skipped over a 15-verse dataset: one full cycle plus four
+    assert (bot.cycle, bot.current_index) == (1, 5)
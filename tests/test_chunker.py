@@ -0,0 +1,65 @@
+"""Message splitting at Telegram's length limit"""
+
+import re
+import unicodedata
+
+from chunker import MESSAGE_LIMIT, split_message, utf16_len
+
+
+def words(text: str) -> list:
+    return text.replace('*', ' ').split()
+
+
+def test_short_message_is_untouched():
+    assert split_message('salam') == ['salam']
+    assert split_message('x' * MESSAGE_LIMIT) == ['x' * MESSAGE_LIMIT]
+
+
+def test_utf16_length_counts_astral_characters_twice():
+    assert utf16_len('a📖') == 3
+    chunks = split_message('📖' * 30, limit=20)
+    assert all(utf16_len(chunk) <= 20 for chunk in chunks)
+    assert ''.join(chunks) == '📖' * 30
+
+
+def test_prefers_paragraph_boundaries():
+    text = 'first paragraph here.\n\nsecond paragraph here.\n\nthird one.'
+    assert split_message(text, limit=30) == ['first paragraph here.', 'second paragraph here.', 'third one.']
+
+
+def test_falls_back_to_word_boundaries_and_keeps_every_word():
+    text = ' '.join(f'word{i}' for i in range(200))
+    chunks = split_message(text, limit=64)
+    assert all(utf16_len(chunk) <= 64 for chunk in chunks)
+    assert ' '.join(chunks).split() == text.split()
+
+
+def test_never_cuts_inside_an_entity():
+    text = 'intro text ' + ' '.join(f'*bold {i}* plain' for i in range(40))
+    for chunk in split_message(text, limit=45):
+        assert chunk.count('*') % 2 == 0
+        assert utf16_len(chunk) <= 45
+
+
+def test_never_cuts_inside_an_html_element_or_escape():
+    text = ' '.join(['<b>one two</b> &amp; a\\.b'] * 30)
+    for chunk in split_message(text, limit=40):
+        assert chunk.count('<b>') == chunk.count('</b>')
+        assert not chunk.endswith('\\')
+        assert not re.search(r'&\w*$', chunk)
+
+
+def test_keeps_arabic_diacritics_with_their_letter():
+    text = 'بِسْمِ' * 40
+    for chunk in split_message(text, limit=25):
+        assert not unicodedata.combining(chunk[0])
+
+
+def test_oversized_entity_is_closed_and_reopened():
+    text = '*' + ' '.join(['long'] * 40) + '*'
+    chunks = split_message(text, limit=50)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.startswith('*') and chunk.endswith('*')
+        assert utf16_len(chunk) <= 50
+    assert words(' '.join(chunks)) == words(text)
@@ -0,0 +1,26 @@
+"""On-demand command replies and the response cache"""
+
+
+def test_verse_reply_is_cached(make_bot):
+    bot = make_bot()
+    first = bot.answer_command('/verse 2:3')
+    assert 'verse 2:3' in first
+    assert bot.answer_command('/verse   2:3') == first
+    assert bot.response_cache.hits == 1
+
+
+def test_error_replies_are_not_cached(make_bot):
+    bot = make_bot()
+    reply = bot.answer_command('/verse 9:1')
+    assert reply.startswith('❌')
+    assert len(bot.response_cache) == 0
+
+
+def test_random_bypasses_cache(make_bot):
+    bot = make_bot()
+    bot.answer_command('/random')
+    assert len(bot.response_cache) == 0
+
+
+def test_unknown_command_is_ignored(make_bot):
+    assert make_bot().answer_command('/unknown') is None
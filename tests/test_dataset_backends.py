@@ -0,0 +1,44 @@
+"""Dataset readers agree with each other and tolerate concurrent row reads"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dataset_backends import open_dataset
+from verse_store import compile_store
+
+
+@pytest.mark.parametrize('backend', ['csv', 'indexed', 'pandas'])
+def test_backends_match_csv(dataset_csv, backend):
+    if backend == 'pandas':
+        pytest.importorskip('pandas')
+    expected = open_dataset(dataset_csv, 'csv')
+    dataset = open_dataset(dataset_csv, backend)
+    assert len(dataset) == len(expected)
+    assert [dataset.row(i) for i in range(len(dataset))] == [expected.row(i) for i in range(len(expected))]
+
+
+def test_projection_keeps_only_requested_columns(dataset_csv):
+    dataset = open_dataset(dataset_csv, 'indexed', ['surah_no', 'ayah_en', 'not_a_column'])
+    assert dataset.columns == ['surah_no', 'ayah_en']
+    assert set(dataset.row(0)) == {'surah_no', 'ayah_en'}
+
+
+def test_indexed_rows_from_many_threads(dataset_csv):
+    expected = open_dataset(dataset_csv, 'csv')
+    dataset = open_dataset(dataset_csv, 'indexed')
+    positions = [i % len(dataset) for i in range(4000)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        rows = list(pool.map(dataset.row, positions))
+    assert rows == [expected.row(i) for i in positions]
+
+
+def test_bom_prefixed_csv(tmp_path, dataset_csv):
+    with open(dataset_csv, 'rb') as f:
+        data = f.read()
+    path = tmp_path / 'bom.csv'
+    path.write_bytes(b'\xef\xbb\xbf' + data)
+    for backend in ('csv', 'indexed'):
+        assert open_dataset(str(path), backend).columns[0] == 'surah_no'
+    compile_store(str(path))
+    assert open_dataset(str(path), 'store').columns[0] == 'surah_no'
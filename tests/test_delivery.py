@@ -0,0 +1,58 @@
+"""Journal outcomes of send_verse: definite failures are retried, in-doubt sends never are"""
+
+import requests
+
+from conftest import FakeResponse, sent
+from journal import CLAIMED, PENDING
+
+
+def claim_status(bot, chat_id='@channel'):
+    return bot.journal.claim(bot.cycle, bot.current_index, chat_id)
+
+
+def test_success_confirms(make_bot):
+    bot = make_bot([sent(42)])
+    assert bot.send_verse('salam', '@channel')
+    assert bot.journal.message_id(bot.cycle, bot.current_index, '@channel') == 42
+
+
+def test_rejected_send_releases_claim(make_bot):
+    bot = make_bot([FakeResponse(400, {'ok': False, 'description': 'chat not found'})])
+    assert not bot.send_verse('salam', '@channel')
+    assert claim_status(bot) == CLAIMED
+
+
+def test_connect_failure_releases_claim(make_bot):
+    bot = make_bot([requests.exceptions.ConnectTimeout('connect timed out')])
+    assert not bot.send_verse('salam', '@channel')
+    assert claim_status(bot) == CLAIMED
+
+
+def test_read_timeout_keeps_claim_pending(make_bot):
+    bot = make_bot([requests.exceptions.ReadTimeout('read timed out')])
+    # In doubt counts as posted, so the run moves on instead of failing
+    assert bot.send_verse('salam', '@channel')
+    assert claim_status(bot) == PENDING
+
+    # The retry must not send again
+    assert bot.send_verse('salam', '@channel')
+    assert len(bot.http.posts) == 1
+
+
+def test_server_error_keeps_claim_pending(make_bot):
+    bot = make_bot([FakeResponse(502, {'ok': False})])
+    assert bot.send_verse('salam', '@channel')
+    assert claim_status(bot) == PENDING
+
+
+def test_partial_chunked_send_keeps_claim_pending(make_bot):
+    bot = make_bot([sent(1), FakeResponse(400, {'ok': False, 'description': 'flood'})])
+    long_message = ('word ' * 200 + '\n\n') * 10
+    assert bot.send_verse(long_message, '@channel')
+    assert len(bot.http.posts) == 2
+    assert claim_status(bot) == PENDING
+
+
+def test_in_doubt_reply_is_reported_as_not_sent(make_bot):
+    bot = make_bot([requests.exceptions.ConnectionError('connection reset by peer')])
+    assert bot.deliver_message('salam', '42') is None
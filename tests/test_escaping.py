@@ -0,0 +1,67 @@
+"""Escaping and pre-send validation for each parse mode"""
+
+import pytest
+
+from escaping import PARSE_MODES, MessageFormatError, bold, escape, validate
+from render_cache import render_footer, render_verse_body, render_verse_card
+
+NASTY = 'a_b *c* [d](e) `f` ~g~ >h #i +j -k =l |m| {n} .o !p \\q <r> & "s" 2:255 (x)'
+
+VERSE = {
+    'surah_no': '2', 'surah_name_en': 'Al-Baqarah', 'ayah_no_surah': '255',
+    'ayah_ar': 'ٱللَّهُ لَآ إِلَٰهَ إِلَّا هُوَ', 'ayah_en': NASTY,
+}
+
+
+@pytest.mark.parametrize('parse_mode', PARSE_MODES)
+def test_escaped_text_validates(parse_mode):
+    validate(escape(NASTY, parse_mode), parse_mode)
+    validate(bold(NASTY, parse_mode), parse_mode)
+
+
+@pytest.mark.parametrize('parse_mode', PARSE_MODES)
+def test_rendered_messages_validate(parse_mode):
+    validate(render_verse_body(VERSE, parse_mode) + render_footer(255, 6236, parse_mode), parse_mode)
+    validate(render_verse_card(VERSE, parse_mode), parse_mode)
+
+
+def test_escape_tables():
+    assert escape('a_b*c', 'Markdown') == 'a\\_b\\*c'
+    assert escape('1.5!', 'MarkdownV2') == '1\\.5\\!'
+    assert escape('<b> & "q"', 'HTML') == '&lt;b&gt; &amp; &quot;q&quot;'
+    assert bold('x', 'HTML') == '<b>x</b>'
+
+
+@pytest.mark.parametrize('parse_mode, text', [
+    ('Markdown', '*unclosed bold'),
+    ('Markdown', 'an `open code span'),
+    ('Markdown', '[link](http://example.com'),
+    ('MarkdownV2', 'ends with a period.'),
+    ('MarkdownV2', 'dangling \\'),
+    ('MarkdownV2', 'a | b'),
+    ('MarkdownV2', '||spoiler'),
+    ('HTML', '<b>unclosed'),
+    ('HTML', '<b><i>crossed</b></i>'),
+    ('HTML', '<script>x</script>'),
+    ('HTML', 'a < b'),
+    ('HTML', 'fish & chips'),
+])
+def test_malformed_markup_is_rejected(parse_mode, text):
+    with pytest.raises(MessageFormatError):
+        validate(text, parse_mode)
+
+
+@pytest.mark.parametrize('parse_mode, text', [
+    ('Markdown', '*bold* _italic_ `code` [link](http://example.com)'),
+    ('Markdown', '*bold with _ inside*'),
+    ('MarkdownV2', '*bold* __underline__ ~strike~ ||spoiler|| 2\\:255 \\(x\\)'),
+    ('MarkdownV2', '>quoted line'),
+    ('HTML', '<b>bold</b> <a href="https://example.com">link</a> &amp; &#1583; &#x62F;'),
+])
+def test_wellformed_markup_is_accepted(parse_mode, text):
+    validate(text, parse_mode)
+
+
+def test_unknown_parse_mode():
+    with pytest.raises(MessageFormatError):
+        validate('text', 'BBCode')
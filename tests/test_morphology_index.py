@@ -0,0 +1,51 @@
+"""Posting-list encoding and root/lemma lookups"""
+
+import pytest
+
+from morphology_index import (MorphologyIndex, build_morphology_index, decode_postings,
+                              encode_postings, normalize_key)
+
+
+@pytest.mark.parametrize('positions', [[], [0], [5, 6, 7], [127, 128, 16383, 16384, 2 ** 21, 2 ** 32 - 1]])
+def test_postings_round_trip(positions):
+    encoded = encode_postings(positions)
+    assert decode_postings(encoded, 0, len(positions)) == positions
+
+
+def test_postings_are_delta_varint_encoded():
+    # gaps 1, 127, 1 and 128: one byte each below 0x80, two bytes from 0x80 up
+    assert encode_postings([1, 128, 129, 257]) == bytes([0x01, 0x7F, 0x01, 0x80, 0x01])
+    assert decode_postings(b'\xff' + encode_postings([300]), 1, 1) == [300]
+
+
+def test_buckwalter_and_arabic_keys_match():
+    assert normalize_key('rHm') == normalize_key('رحم') == normalize_key(' رَحِمَ ')
+    assert normalize_key('{ll~ah') == normalize_key('ٱللَّه')
+
+
+@pytest.fixture
+def morphology_file(tmp_path):
+    path = tmp_path / 'morphology.txt'
+    path.write_text(
+        '# comment line\n'
+        '(1:1:1:1)\tbi\tP\tPREFIX|bi+\n'
+        '(1:1:1:2)\tsomi\tN\tSTEM|POS:N|LEM:{som|ROOT:smw|M|GEN\n'
+        '(1:3:1:1)\tr~aHoma`ni\tN\tSTEM|POS:N|LEM:r~aHoma`n|ROOT:rHm|MS|GEN\n'
+        '2:1:1:1\tr~aHiymi\tADJ\tSTEM|POS:ADJ|LEM:r~aHiym|ROOT:rHm|MS|GEN\n'
+        '(9:1:1:1)\tx\tN\tSTEM|ROOT:rHm\n',
+        encoding='utf-8')
+    return str(path)
+
+
+def test_build_and_lookup(dataset_csv, morphology_file, tmp_path):
+    path = build_morphology_index(dataset_csv, morphology_file, str(tmp_path / 'test.qmx'))
+    index = MorphologyIndex(path)
+    try:
+        # 1:3 is row 2 and 2:1 is row 7; 9:1 is not in the dataset and is skipped
+        assert index.root('rHm') == [2, 7]
+        assert index.root('رحم') == [2, 7]
+        assert index.lemma('{som') == [0]
+        assert index.root('ktb') == []
+        assert index.matches_source(dataset_csv)
+    finally:
+        index.close()
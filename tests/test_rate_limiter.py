@@ -0,0 +1,37 @@
+"""Token buckets, 429 retries and pruning of idle per-chat buckets"""
+
+import time
+
+from rate_limiter import OutboundScheduler, RetryAfter, TokenBucket
+
+
+def test_bucket_waits_once_empty():
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.05 < bucket.reserve() <= 0.1
+
+
+def test_retries_after_429_then_gives_up(caplog):
+    scheduler = OutboundScheduler(global_rate=1e9, max_retries=2, sleep=lambda seconds: None)
+    attempts = []
+
+    def always_limited():
+        attempts.append(1)
+        raise RetryAfter(0)
+
+    assert scheduler.send('42', always_limited) is False
+    assert len(attempts) == 3
+    assert 'retry 3/2' not in caplog.text
+
+
+def test_idle_full_buckets_are_pruned():
+    scheduler = OutboundScheduler(global_rate=1e9, sleep=lambda seconds: None, idle_seconds=60)
+    for chat_id in range(100):
+        scheduler.send(chat_id, lambda: True)
+    scheduler.chat_bucket('-100').block_for(3600)
+
+    assert scheduler.prune(time.monotonic() + 30) == 0
+    # Private chats refill in a second; the blocked group bucket is kept
+    assert scheduler.prune(time.monotonic() + 120) == 100
+    assert list(scheduler._chat_buckets) == ['-100']
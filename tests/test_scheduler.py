@@ -0,0 +1,74 @@
+"""Cron parsing and slot counting used by daemon mode and catch-up"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from scheduler import CronSchedule, _parse_field
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('field, expected', [
+    ('*', set(range(0, 60))),
+    ('5', {5}),
+    ('1-5', {1, 2, 3, 4, 5}),
+    ('*/15', {0, 15, 30, 45}),
+    ('0,30', {0, 30}),
+    ('10-20/5', {10, 15, 20}),
+    ('50/5', {50, 55}),
+])
+def test_parse_field(field, expected):
+    assert _parse_field(field, 0, 59) == expected
+
+
+@pytest.mark.parametrize('expression', ['* * * *', '60 * * * *', '* 24 * * *', '*/0 * * * *',
+                                        '5-1 * * * *', 'a * * * *'])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_sunday_is_0_or_7():
+    assert CronSchedule('0 0 * * 7').weekdays == {0}
+    # 2026-01-04 is a Sunday
+    assert CronSchedule('0 0 * * 0').matches(utc(2026, 1, 4, 0, 0))
+
+
+def test_next_after_hourly():
+    schedule = CronSchedule('0 * * * *')
+    assert schedule.next_after(utc(2026, 1, 1, 12, 0, 30)) == utc(2026, 1, 1, 13, 0)
+    # Strictly after: a firing time is not its own successor
+    assert schedule.next_after(utc(2026, 1, 1, 13, 0)) == utc(2026, 1, 1, 14, 0)
+
+
+def test_next_after_rolls_over_month_and_year():
+    assert CronSchedule('30 6 1 * *').next_after(utc(2026, 1, 15)) == utc(2026, 2, 1, 6, 30)
+    assert CronSchedule('0 0 1 1 *').next_after(utc(2026, 6, 1)) == utc(2027, 1, 1, 0, 0)
+
+
+def test_day_of_month_or_weekday():
+    # Standard cron: with both day fields restricted, either may match
+    schedule = CronSchedule('0 9 13 * 5')
+    assert schedule.matches(utc(2026, 1, 13, 9, 0))   # the 13th, a Tuesday
+    assert schedule.matches(utc(2026, 1, 16, 9, 0))   # a Friday
+    assert not schedule.matches(utc(2026, 1, 14, 9, 0))
+
+
+def test_never_firing_expression():
+    with pytest.raises(ValueError):
+        CronSchedule('0 0 31 2 *').next_after(utc(2026, 1, 1))
+
+
+def test_slots_between_is_half_open():
+    schedule = CronSchedule('0 * * * *')
+    slots = schedule.slots_between(utc(2026, 1, 1, 10, 0), utc(2026, 1, 1, 13, 0))
+    assert slots == [utc(2026, 1, 1, 11, 0), utc(2026, 1, 1, 12, 0), utc(2026, 1, 1, 13, 0)]
+    assert schedule.slots_between(utc(2026, 1, 1, 10, 1), utc(2026, 1, 1, 10, 59)) == []
+
+
+def test_slots_between_respects_limit():
+    schedule = CronSchedule('* * * * *')
+    assert len(schedule.slots_between(utc(2026, 1, 1), utc(2026, 1, 2), limit=25)) == 25
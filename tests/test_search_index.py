@@ -0,0 +1,96 @@
+"""Analyzers, BM25 ranking and the persisted .qsx index"""
+
+import csv
+
+import pytest
+
+from dataset_backends import open_dataset
+from search_index import (SearchIndex, load_search_index, normalize_arabic, search_index_path_for,
+                          stem_english)
+from verse_store import file_sha256
+
+
+def test_normalize_arabic_strips_marks_and_unifies_letters():
+    assert normalize_arabic('بِسْمِ ٱللَّهِ') == 'بسم الله'
+    assert normalize_arabic('رَحْمَـٰنِ') == 'رحمن'
+    assert normalize_arabic('أإآ ى ة ؤ') == 'ااا ي ه و'
+
+
+@pytest.mark.parametrize('word, stem', [
+    ('mercies', 'mercy'), ('mercy', 'mercy'),
+    ('believe', 'believ'), ('believed', 'believ'), ('believing', 'believ'),
+    ('righteousness', 'righteous'), ('kindly', 'kind'),
+    ('sin', 'sin'), ('grass', 'grass'),
+])
+def test_stem_english(word, stem):
+    assert stem_english(word) == stem
+
+
+def english_dataset(path, verses):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ayah_no_quran', 'ayah_en'])
+        writer.writerows(enumerate(verses, 1))
+    return open_dataset(str(path))
+
+
+def test_bm25_ranks_frequent_and_short_matches_first(tmp_path):
+    dataset = english_dataset(tmp_path / 'en.csv', [
+        'light upon light',
+        'mercy and light in the heavens and the earth',
+        'mercy mercy',
+        'mercy',
+        'his mercies encompass all things',
+    ])
+    index = SearchIndex.build(dataset, ['ayah_en'])
+
+    ranked = [row for row, _ in index.search('mercy')]
+    assert ranked[:2] == [2, 3]
+    assert set(ranked[2:]) == {1, 4}
+    assert 0 not in ranked
+    scores = [score for _, score in index.search('mercy')]
+    assert scores == sorted(scores, reverse=True)
+    assert index.search('mercy', limit=1) == index.search('mercy')[:1]
+
+
+def test_equal_scores_keep_canonical_order(tmp_path):
+    dataset = english_dataset(tmp_path / 'en.csv', ['light', 'mercy', 'light', 'light'])
+    index = SearchIndex.build(dataset, ['ayah_en'])
+    assert [row for row, _ in index.search('light')] == [0, 2, 3]
+
+
+def test_diacritized_query_finds_bare_spelling(dataset_csv):
+    index = SearchIndex.build(open_dataset(dataset_csv), ['ayah_ar'])
+    assert len(index.search('بسم', limit=100)) == len(index)
+
+
+def test_saved_index_round_trips(dataset_csv):
+    columns = ('ayah_ar', 'ayah_en')
+    built = load_search_index(dataset_csv, columns=columns)
+    path = search_index_path_for(dataset_csv)
+    loaded = SearchIndex.load(path, file_sha256(dataset_csv), columns)
+
+    assert loaded is not None
+    assert loaded.columns == built.columns
+    assert loaded.terms == built.terms
+    assert loaded.search('verse name') == built.search('verse name')
+
+
+def test_saved_index_is_rejected_for_other_columns_or_source(dataset_csv):
+    load_search_index(dataset_csv, columns=('ayah_ar', 'ayah_en'))
+    path = search_index_path_for(dataset_csv)
+    source_sha = file_sha256(dataset_csv)
+
+    assert SearchIndex.load(path, source_sha, ('ayah_en',)) is None
+    assert SearchIndex.load(path, bytes(32), ('ayah_ar', 'ayah_en')) is None
+    assert SearchIndex.load(str(path) + '.missing', source_sha, ('ayah_ar', 'ayah_en')) is None
+
+
+def test_stale_index_is_rebuilt(dataset_csv):
+    load_search_index(dataset_csv, columns=('ayah_en',))
+    with open(dataset_csv, 'a', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow([4, 'Surah 4', 'سورة', 1, 16, 'رحمة', 'Mercy to the worlds', 2, 5])
+
+    index = load_search_index(dataset_csv, columns=('ayah_en',))
+    assert len(index) == 16
+    assert [row for row, _ in index.search('mercy')] == [15]
@@ -0,0 +1,45 @@
+"""Compiled sidecars are only used while they match the CSV byte for byte"""
+
+import pytest
+
+from dataset_backends import open_dataset
+from verse_store import VerseStore, compile_store
+
+
+def edit_same_size(path):
+    """Swap two letters in the first translation without changing the file size"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    edited = data.replace(b'In the name', b'In the nmae', 1)
+    assert len(edited) == len(data) and edited != data
+    with open(path, 'wb') as f:
+        f.write(edited)
+
+
+def test_store_rejects_same_size_edit(dataset_csv):
+    store = VerseStore(compile_store(dataset_csv))
+    try:
+        assert store.matches_source(dataset_csv)
+        edit_same_size(dataset_csv)
+        assert not store.matches_source(dataset_csv)
+    finally:
+        store.close()
+
+
+def test_auto_backend_reads_the_edited_csv(dataset_csv):
+    compile_store(dataset_csv)
+    assert open_dataset(dataset_csv).name == 'store'
+    edit_same_size(dataset_csv)
+    dataset = open_dataset(dataset_csv)
+    assert dataset.name == 'indexed'
+    assert dataset.row(0)['ayah_en'].startswith('In the nmae')
+
+
+def test_parquet_rejects_same_size_edit(dataset_csv):
+    pytest.importorskip('pyarrow')
+    from columnar import convert_csv
+    convert_csv(dataset_csv)
+    assert open_dataset(dataset_csv, 'parquet').is_fresh()
+    edit_same_size(dataset_csv)
+    assert not open_dataset(dataset_csv, 'parquet').is_fresh()
+
@@ -0,0 +1,153 @@
+"""GitHubStateStore against a stubbed contents API"""
+
+import base64
+import hashlib
+import json
+
+import pytest
+
+from conftest import FakeResponse
+from state_store import GitHubStateStore
+
+
+def blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def encode(state: dict) -> bytes:
+    return json.dumps(state, indent=2).encode('utf-8')
+
+
+class ContentsApi:
+    """Stands in for HttpClient in front of one file of the contents API"""
+
+    def __init__(self, state=None):
+        self.requests = []
+        self.state = None
+        self.sha = None
+        self.etag = None
+        if state is not None:
+            self.commit(state)
+
+    def commit(self, state: dict):
+        """A new version lands, as if committed by another run"""
+        self.state = state
+        self.sha = blob_sha(encode(state))
+        self.etag = f'"{self.sha}"'
+
+    def get(self, url, headers=None):
+        self.requests.append('GET')
+        if self.state is None:
+            return FakeResponse(404, {})
+        if headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304, {})
+        content = base64.b64encode(encode(self.state)).decode('ascii')
+        response = FakeResponse(200, {'sha': self.sha, 'content': content})
+        response.headers = {'ETag': self.etag}
+        return response
+
+    def put(self, url, headers=None, **kwargs):
+        self.requests.append('PUT')
+        payload = kwargs['json']
+        if payload.get('sha') != self.sha:
+            return FakeResponse(409, {'message': 'sha does not match'})
+        self.commit(json.loads(base64.b64decode(payload['content'])))
+        return FakeResponse(200, {'content': {'sha': self.sha}})
+
+
+@pytest.fixture
+def store_for(tmp_path, monkeypatch):
+    """Stores share bot_state.json and the cache file, like consecutive workflow runs"""
+    monkeypatch.chdir(tmp_path)
+    return lambda api: GitHubStateStore(api, 'https://api.github.test', 'token', 'owner/repo')
+
+
+def checkout(api):
+    """What actions/checkout leaves in the working directory"""
+    with open('bot_state.json', 'wb') as f:
+        f.write(encode(api.state))
+
+
+def test_own_save_skips_the_next_fetch(store_for):
+    api = ContentsApi({'current_index': 1})
+    store = store_for(api)
+    store.load()
+    store.save({'current_index': 2})
+    checkout(api)
+    api.requests.clear()
+
+    assert store_for(api).load() == {'current_index': 2}
+    assert api.requests == []
+
+
+def test_changed_checkout_is_fetched(store_for):
+    api = ContentsApi({'current_index': 1})
+    store = store_for(api)
+    store.load()
+    store.save({'current_index': 2})
+    api.commit({'current_index': 9})
+    checkout(api)
+
+    assert store_for(api).load() == {'current_index': 9}
+    assert api.requests[-1] == 'GET'
+
+
+def test_unchanged_state_without_checkout_costs_a_304(store_for):
+    api = ContentsApi({'current_index': 1})
+    assert store_for(api).load() == {'current_index': 1}
+    api.requests.clear()
+
+    assert store_for(api).load() == {'current_index': 1}
+    assert api.requests == ['GET']
+
+
+class RacingApi(ContentsApi):
+    """Another run commits each of racer_states just before one of our PUTs lands"""
+
+    def __init__(self, state, racer_states):
+        super().__init__(state)
+        self.racer_states = list(racer_states)
+
+    def put(self, url, headers=None, **kwargs):
+        if self.racer_states:
+            self.commit(self.racer_states.pop(0))
+        return super().put(url, headers, **kwargs)
+
+
+def read_local():
+    with open('bot_state.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_conflict_with_remote_behind_is_put_again_with_new_sha(store_for):
+    api = RacingApi({'current_index': 1}, [{'current_index': 2}])
+    store = store_for(api)
+    store.load()
+    store.save({'current_index': 5})
+
+    assert api.state == {'current_index': 5}
+    assert api.requests == ['GET', 'PUT', 'GET', 'PUT']
+    assert store.sha == api.sha
+    assert read_local() == {'current_index': 5}
+
+
+def test_conflict_with_remote_ahead_keeps_theirs(store_for):
+    api = RacingApi({'current_index': 1}, [{'current_index': 7}])
+    store = store_for(api)
+    store.load()
+    store.save({'current_index': 2})
+
+    assert api.state == {'current_index': 7}
+    assert api.requests == ['GET', 'PUT', 'GET']
+    # The summary reads the local copy, so it must show what was committed
+    assert read_local() == {'current_index': 7}
+
+
+def test_conflicts_beyond_max_retries_raise(store_for):
+    api = RacingApi({'current_index': 1}, [{'current_index': 2, 'race': race} for race in range(4)])
+    store = store_for(api)
+    store.load()
+
+    with pytest.raises(RuntimeError, match='kept conflicting'):
+        store.save({'current_index': 5})
+    assert api.requests.count('PUT') == store.max_retries + 1
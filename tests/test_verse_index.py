@@ -0,0 +1,71 @@
+"""Verse lookups through the .vix sidecar"""
+
+import csv
+
+import pytest
+
+from conftest import write_dataset
+from verse_index import load_verse_index, parse_reference
+
+
+@pytest.fixture
+def index(dataset_csv):
+    return load_verse_index(dataset_csv)
+
+
+def test_parse_reference():
+    assert parse_reference('2:255') == (2, 255, 255)
+    assert parse_reference(' 2 . 255 - 257 ') == (2, 255, 257)
+    with pytest.raises(ValueError):
+        parse_reference('two:255')
+
+
+def test_lookup_and_ranges(index):
+    assert index.surah_count == 3
+    assert index.lookup(1, 1) == 0
+    assert index.lookup(2, 5) == 11
+    assert index.resolve('3:1-3') == [12, 13, 14]
+    assert index.surah_rows(2) == list(range(7, 12))
+    with pytest.raises(KeyError):
+        index.lookup(2, 6)
+    with pytest.raises(KeyError):
+        index.lookup(4, 1)
+
+
+def test_juz_and_hizb_quarters(index):
+    # conftest numbers juz as 1 + n // 8 for verse number n
+    assert index.juz_rows(1) == list(range(0, 7))
+    assert index.juz_rows(2) == list(range(7, 15))
+
+
+def test_sidecar_is_reused_and_rebuilt(dataset_csv, index):
+    assert load_verse_index(dataset_csv).order == index.order
+    write_dataset(dataset_csv, (2, 2))
+    assert load_verse_index(dataset_csv).surah_count == 2
+
+
+def test_shuffled_rows_keep_canonical_order(tmp_path, dataset_csv):
+    with open(dataset_csv, newline='', encoding='utf-8') as f:
+        header, *rows = list(csv.reader(f))
+    shuffled = tmp_path / 'shuffled.csv'
+    with open(shuffled, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows([header] + rows[::-1])
+    index = load_verse_index(str(shuffled))
+    assert index.lookup(1, 1) == len(rows) - 1
+
+
+def test_per_hizb_quarter_numbering_disables_only_hizb_lookups(tmp_path, dataset_csv):
+    with open(dataset_csv, newline='', encoding='utf-8') as f:
+        header, *rows = list(csv.reader(f))
+    quarter = header.index('hizb_quarter')
+    for position, row in enumerate(rows):
+        row[quarter] = str(1 + position // 2 % 4)
+    path = tmp_path / 'quarters.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows([header] + rows)
+
+    index = load_verse_index(str(path))
+    assert index.lookup(2, 1) == 7
+    assert index.juz_rows(1)
+    with pytest.raises(ValueError):
+        index.hizb_quarter_rows(1)
@@ -0,0 +1,71 @@
+"""WebhookServer on a real socket: secret check, de-duplication and inline replies"""
+
+import threading
+
+import pytest
+import requests
+
+from webhook import SECRET_HEADER, WebhookServer
+
+SECRET = 'test-secret'
+
+
+def fixture_update(update_id: int, text: str, chat_id: int = 7) -> dict:
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': 0,
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Test'},
+            'text': text,
+        },
+    }
+
+
+@pytest.fixture
+def post(make_bot):
+    """post(update, secret) against a server on an ephemeral port"""
+    bot = make_bot()
+    server = WebhookServer(bot.webhook_reply, SECRET, host='127.0.0.1', port=0, workers=2)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    assert server.ready.wait(10)
+    url = f"http://127.0.0.1:{server.port}{server.path}"
+
+    def send(update: dict, secret: str = SECRET):
+        return requests.post(url, json=update, headers={SECRET_HEADER: secret}, timeout=10)
+
+    send.bot = bot
+    yield send
+    server.stop()
+    thread.join(10)
+
+
+def test_wrong_secret_is_rejected(post):
+    assert post(fixture_update(1, '/help'), 'wrong').status_code == 401
+    assert post(fixture_update(1, '/help'), secret='').status_code == 401
+
+
+def test_command_reply_goes_inline(post):
+    response = post(fixture_update(2, '/verse 1:2'))
+    assert response.status_code == 200
+    body = response.json()
+    assert body['method'] == 'sendMessage'
+    assert str(body['chat_id']) == '7'
+    assert '1:2' in body['text']
+    # Nothing went out through the Bot API itself
+    assert post.bot.http.posts == []
+
+
+def test_repeated_update_is_acknowledged_without_reply(post):
+    assert post(fixture_update(3, '/verse 1:2')).json()['method'] == 'sendMessage'
+    response = post(fixture_update(3, '/verse 1:2'))
+    assert response.status_code == 200
+    assert response.content == b''
+
+
+def test_plain_message_gets_an_empty_reply(post):
+    response = post(fixture_update(4, 'just chatting'))
+    assert response.status_code == 200
+    assert response.content == b''
@@ -0,0 +1,74 @@
+"""Consecutive scheduled runs, with the journal carried over the way the workflow cache does"""
+
+import os
+import shutil
+
+import pytest
+import requests
+
+import github_actions_bot
+from conftest import FakeResponse, sent, write_dataset
+from http_session import HttpClient
+from journal import PostJournal
+
+
+@pytest.fixture
+def runs(tmp_path, monkeypatch):
+    """run(outcome) executes main() once; the journal is only kept if the run succeeded"""
+    monkeypatch.chdir(tmp_path)
+    write_dataset(tmp_path / 'quran_dataset.csv')
+    for name, value in {'BOT_TOKEN': '123:test', 'CHANNEL_ID': '@channel', 'STATE_BACKEND': 'file',
+                        'TELEGRAM_PROBE': 'optimistic', 'POST_JOURNAL': 'post_journal.db'}.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv('CHANNEL_IDS', raising=False)
+
+    posts = []
+    script = []
+
+    def post(self, url, json=None, **kwargs):
+        posts.append(json['text'])
+        outcome = script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(HttpClient, 'post', post)
+    cached_journal = tmp_path / 'cache' / 'post_journal.db'
+
+    def run(outcome) -> bool:
+        # A fresh runner: only the cache (and the committed state) survive
+        if os.path.exists('post_journal.db'):
+            os.remove('post_journal.db')
+        if cached_journal.exists():
+            shutil.copy(cached_journal, 'post_journal.db')
+        script[:] = [outcome]
+        ok = github_actions_bot.main()
+        if ok:
+            cached_journal.parent.mkdir(exist_ok=True)
+            shutil.copy('post_journal.db', cached_journal)
+        return ok
+
+    run.posts = posts
+    return run
+
+
+def test_in_doubt_send_is_not_repeated_by_the_next_run(runs):
+    assert runs(requests.exceptions.ReadTimeout('read timed out'))
+    assert runs(sent(2))
+    first, second = runs.posts
+    assert '1:1' in first and '1:2' in second
+
+
+def test_definite_failure_is_retried_by_the_next_run(runs):
+    assert not runs(FakeResponse(400, {'ok': False, 'description': 'Bad Request'}))
+    assert runs(sent(1))
+    assert runs.posts[0] == runs.posts[1]
+
+
+def test_journal_is_readable_after_main_exits(runs):
+    assert runs(sent(7))
+    journal = PostJournal('cache/post_journal.db')
+    try:
+        assert journal.message_id(0, 0, '@channel') == 7
+    finally:
+        journal.close()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Translations - Which translation columns each channel receives
+A multi-translation dataset has one ayah_<language> column per translation
+(ayah_en, ayah_ur, ayah_id, ayah_tr, ...). Each channel picks its columns and
+only the columns some channel uses are loaded.
+"""
+
+# Needed for every message regardless of translation
+BASE_COLUMNS = ('surah_name_en', 'ayah_no_surah', 'surah_no', 'ayah_ar')
+
+DEFAULT_TRANSLATIONS = ('ayah_en',)
+
+TRANSLATION_PREFIX = 'ayah_'
+
+LANGUAGE_NAMES = {
+    'bn': 'Bengali',
+    'de': 'German',
+    'en': 'English',
+    'es': 'Spanish',
+    'fa': 'Persian',
+    'fr': 'French',
+    'id': 'Indonesian',
+    'ms': 'Malay',
+    'ru': 'Russian',
+    'tr': 'Turkish',
+    'ur': 'Urdu',
+}
+
+
+def parse_translations(value) -> tuple:
+    """Normalize 'en,ur', ['ayah_en', 'ur'] etc. to a tuple of column names"""
+    if not value:
+        return DEFAULT_TRANSLATIONS
+    items = value.split(',') if isinstance(value, str) else value
+    columns = []
+    for item in items:
+        item = str(item).strip()
+        if not item:
+            continue
+        column = item if item.startswith(TRANSLATION_PREFIX) else TRANSLATION_PREFIX + item
+        if column == 'ayah_ar':
+            raise ValueError("The Arabic text is always included; list translations only")
+        if column not in columns:
+            columns.append(column)
+    return tuple(columns) or DEFAULT_TRANSLATIONS
+
+
+def language_code(column: str) -> str:
+    """'ayah_ur' -> 'ur'"""
+    return column[len(TRANSLATION_PREFIX):] if column.startswith(TRANSLATION_PREFIX) else column
+
+
+def translation_label(column: str) -> str:
+    """Heading shown above a translation, e.g. 'Urdu'"""
+    code = language_code(column)
+    return LANGUAGE_NAMES.get(code.lower(), code.replace('_', ' ').title())
+
+
+def required_columns(translation_sets) -> list:
+    """Projection for the loader: the base columns plus every translation in use"""
+    columns = list(BASE_COLUMNS)
+    for translations in translation_sets:
+        for column in translations:
+            if column not in columns:
+                columns.append(column)
+    return columns
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Updates - Long-polling getUpdates loop for interactive commands
+One thread long-polls Telegram and tracks the update offset; updates are
+dispatched to asyncio workers, sharded by chat so each chat is answered in order.
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Seconds Telegram holds a getUpdates call open when there is nothing to deliver
+POLL_TIMEOUT = 30
+
+
+class UpdatePoller:
+    """getUpdates with offset tracking; each call acknowledges the previous batch"""
+
+    def __init__(self, http, base_url: str, timeout: int = POLL_TIMEOUT, limit: int = 100,
+                 allowed_updates=('message',)):
+        self.http = http
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limit = limit
+        self.allowed_updates = list(allowed_updates)
+        self.offset = None
+
+    def fetch(self) -> list:
+        """Block until updates arrive (or the long-poll times out) and return them"""
+        payload = {
+            'timeout': self.timeout,
+            'limit': self.limit,
+            'allowed_updates': self.allowed_updates,
+        }
+        if self.offset is not None:
+            payload['offset'] = self.offset
+
+        response = self.http.post(f"{self.base_url}/getUpdates", json=payload,
+                                  timeout=(5, self.timeout + 10))
+        result = response.json() if response.status_code in (200, 409, 429) else {}
+        if response.status_code != 200 or not result.get('ok'):
+            description = result.get('description') or response.text
+            raise RuntimeError(f"getUpdates failed: {response.status_code} - {description}")
+
+        updates = result['result']
+        if updates:
+            # Confirms everything up to here on the next call
+            self.offset = updates[-1]['update_id'] + 1
+        return updates
+
+
+def update_chat_id(update: dict):
+    """Chat an update belongs to (None for update types without one)"""
+    for key in ('message', 'edited_message', 'channel_post', 'edited_channel_post'):
+        if key in update:
+            return update[key].get('chat', {}).get('id')
+    return None
+
+
+class UpdateEngine:
+    """Feeds updates from fetch_updates() to handle_update(update) on a worker pool
+
+    Blocking calls (the long-poll and each handler) run on a thread pool driven by
+    asyncio; a handler failure is logged and never stops the loop.
+    """
+
+    def __init__(self, fetch_updates, handle_update, workers: int = 8,
+                 queue_size: int = 1000, error_backoff: float = 5.0):
+        self.fetch_updates = fetch_updates
+        self.handle_update = handle_update
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.error_backoff = error_backoff
+        self.processed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        """Ask the loop to exit after the current poll; safe to use as a signal handler"""
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        """Stop cleanly on SIGINT/SIGTERM"""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    async def run_async(self):
+        loop = asyncio.get_running_loop()
+        queues = [asyncio.Queue(self.queue_size) for _ in range(self.workers)]
+
+        # One extra thread so the long-poll never waits behind handlers
+        with ThreadPoolExecutor(max_workers=self.workers + 1, thread_name_prefix='updates') as pool:
+
+            async def worker(queue):
+                while True:
+                    update = await queue.get()
+                    try:
+                        await loop.run_in_executor(pool, self.handle_update, update)
+                        self.processed += 1
+                    except Exception as e:
+                        self.failed += 1
+                        logger.error(f"❌ Update {update.get('update_id')} failed: {e}")
+                    finally:
+                        queue.task_done()
+
+            tasks = [asyncio.create_task(worker(queue)) for queue in queues]
+
+            while not self._stop.is_set():
+                try:
+                    updates = await loop.run_in_executor(pool, self.fetch_updates)
+                except Exception as e:
+                    logger.error(f"❌ Polling error, retrying in {self.error_backoff:.0f}s: {e}")
+                    await loop.run_in_executor(pool, self._stop.wait, self.error_backoff)
+                    continue
+
+                for update in updates:
+                    chat_id = update_chat_id(update)
+                    shard = hash(chat_id if chat_id is not None else update.get('update_id'))
+                    await queues[shard % self.workers].put(update)
+
+            # Finish what was already received before shutting the workers down
+            for queue in queues:
+                await queue.join()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info(f"🛑 Update loop stopped ({self.processed} handled, {self.failed} failed)")
+
+    def run(self):
+        """Blocking entry point; returns when stopped"""
+        asyncio.run(self.run_async())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Verse Index - (surah, ayah) -> row lookups without scanning the dataset
+Rows are kept in canonical order in one integer array with per-surah prefix
+offsets, so "2:255" is two array reads. Juz and hizb-quarter boundaries use the
+same layout when the dataset has juz_no / hizb_quarter columns.
+
+Build the sidecar next to the dataset (optional, it is built on first use otherwise):
+    python verse_index.py quran_dataset.csv
+"""
+
+import array
+import logging
+import os
+import re
+import struct
+import sys
+
+from dataset_backends import CsvBackend
+from verse_store import file_sha256
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b'QVI1'
+INDEX_EXTENSION = '.vix'
+
+INDEX_COLUMNS = ('surah_no', 'ayah_no_surah', 'juz_no', 'hizb_quarter')
+
+# magic, surahs, verses, juz count, hizb-quarter count, SHA-256 of the source CSV
+_INDEX_HEADER = struct.Struct('<4sIIII32s')
+
+_REFERENCE = re.compile(r'^\s*(\d{1,3})\s*[:.]\s*(\d{1,3})(?:\s*-\s*(\d{1,3}))?\s*$')
+
+
+def verse_index_path_for(csv_file_path: str) -> str:
+    """Return the lookup index path that sits next to a CSV dataset"""
+    return os.path.splitext(csv_file_path)[0] + INDEX_EXTENSION
+
+
+def parse_reference(reference: str):
+    """'2:255' -> (2, 255, 255); '2:255-257' -> (2, 255, 257)"""
+    match = _REFERENCE.match(reference or '')
+    if not match:
+        raise ValueError(f"Not a verse reference: '{reference}' (expected surah:ayah, e.g. 2:255)")
+    surah, first, last = match.group(1), match.group(2), match.group(3) or match.group(2)
+    return int(surah), int(first), int(last)
+
+
+def _optional_number(value):
+    """Integer value of an optional column, None when it is empty or not a number"""
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _boundaries(values: list, name: str) -> array.array:
+    """Prefix offsets for a grouping that runs 1..n in canonical order
+
+    Empty if the column is absent or numbered differently (e.g. quarters 1-4 within
+    each hizb): surah/ayah lookups do not depend on it, so that is not an error.
+    """
+    offsets = array.array('I')
+    if not values or any(value is None for value in values):
+        return offsets
+    previous = 0
+    for position, value in enumerate(values):
+        if value < previous or value > previous + 1:
+            logger.warning(f"⚠️ {name} {value} is out of order at verse position {position}, "
+                           f"{name.lower()} lookups are disabled")
+            return array.array('I')
+        if value == previous + 1:
+            offsets.append(position)
+            previous = value
+    offsets.append(len(values))
+    return offsets
+
+
+class VerseIndex:
+    """Canonical-order row numbers plus prefix offsets per surah, juz and hizb quarter"""
+
+    def __init__(self, order: array.array, surah_offsets: array.array,
+                 juz_offsets: array.array = None, hizb_offsets: array.array = None):
+        self.order = order
+        self.surah_offsets = surah_offsets
+        self.juz_offsets = juz_offsets or array.array('I')
+        self.hizb_offsets = hizb_offsets or array.array('I')
+
+    @classmethod
+    def build(cls, dataset) -> 'VerseIndex':
+        """Build the index from any dataset backend with surah_no and ayah_no_surah"""
+        entries = []
+        for row_number in range(len(dataset)):
+            row = dataset.row(row_number)
+            entries.append((
+                int(row['surah_no']), int(row['ayah_no_surah']), row_number,
+                _optional_number(row.get('juz_no')),
+                _optional_number(row.get('hizb_quarter')),
+            ))
+        entries.sort()
+
+        order = array.array('I', (entry[2] for entry in entries))
+        # Entry 0 is a placeholder so surah s spans [surah_offsets[s], surah_offsets[s + 1])
+        surah_offsets = array.array('I', [0])
+        for position, (surah, ayah, _, _, _) in enumerate(entries):
+            if ayah == 1 and surah == len(surah_offsets):
+                surah_offsets.append(position)
+            elif surah != len(surah_offsets) - 1 or ayah != position - surah_offsets[-1] + 1:
+                raise ValueError(f"Verse {surah}:{ayah} breaks the surah/ayah sequence")
+        surah_offsets.append(len(entries))
+
+        return cls(order, surah_offsets,
+                   _boundaries([entry[3] for entry in entries], 'Juz'),
+                   _boundaries([entry[4] for entry in entries], 'Hizb quarter'))
+
+    @property
+    def surah_count(self) -> int:
+        return max(len(self.surah_offsets) - 2, 0)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def surah_bounds(self, surah: int):
+        """Canonical positions [start, end) of a surah"""
+        if not 1 <= surah <= self.surah_count:
+            raise KeyError(f"Surah {surah} does not exist (1-{self.surah_count})")
+        return self.surah_offsets[surah], self.surah_offsets[surah + 1]
+
+    def ayah_count(self, surah: int) -> int:
+        start, end = self.surah_bounds(surah)
+        return end - start
+
+    def lookup(self, surah: int, ayah: int) -> int:
+        """Dataset row of surah:ayah"""
+        start, end = self.surah_bounds(surah)
+        if not 1 <= ayah <= end - start:
+            raise KeyError(f"Surah {surah} has no ayah {ayah} (1-{end - start})")
+        return self.order[start + ayah - 1]
+
+    def resolve(self, reference: str) -> list:
+        """Dataset rows for '2:255' or a range such as '2:255-257'"""
+        surah, first, last = parse_reference(reference)
+        if last < first:
+            raise ValueError(f"Empty verse range: '{reference}'")
+        # Validates both ends of the range
+        self.lookup(surah, first)
+        self.lookup(surah, last)
+        start = self.surah_bounds(surah)[0]
+        return self.order[start + first - 1:start + last].tolist()
+
+    def surah_rows(self, surah: int) -> list:
+        start, end = self.surah_bounds(surah)
+        return self.order[start:end].tolist()
+
+    def _group_rows(self, offsets: array.array, number: int, name: str) -> list:
+        if not offsets:
+            raise ValueError(f"The dataset has no {name} information")
+        if not 1 <= number < len(offsets):
+            raise KeyError(f"{name} {number} does not exist (1-{len(offsets) - 1})")
+        return self.order[offsets[number - 1]:offsets[number]].tolist()
+
+    def juz_rows(self, juz: int) -> list:
+        return self._group_rows(self.juz_offsets, juz, 'Juz')
+
+    def hizb_quarter_rows(self, quarter: int) -> list:
+        return self._group_rows(self.hizb_offsets, quarter, 'Hizb quarter')
+
+    def save(self, path: str, source_sha: bytes):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as out:
+            out.write(_INDEX_HEADER.pack(INDEX_MAGIC, len(self.surah_offsets), len(self.order),
+                                         len(self.juz_offsets), len(self.hizb_offsets), source_sha))
+            for values in (self.surah_offsets, self.order, self.juz_offsets, self.hizb_offsets):
+                out.write(values.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, source_sha: bytes):
+        """Read a saved index, or return None if it is missing, corrupt or stale"""
+        try:
+            with open(path, 'rb') as f:
+                magic, *counts, indexed_sha = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or indexed_sha != source_sha:
+                    return None
+                arrays = []
+                for count in counts:
+                    values = array.array('I')
+                    values.frombytes(f.read(count * values.itemsize))
+                    if len(values) != count:
+                        return None
+                    arrays.append(values)
+        except (OSError, struct.error):
+            return None
+        surah_offsets, order, juz_offsets, hizb_offsets = arrays
+        return cls(order, surah_offsets, juz_offsets, hizb_offsets)
+
+
+def load_verse_index(csv_file_path: str) -> VerseIndex:
+    """Load the sidecar index, rebuilding it when it does not match the CSV hash"""
+    index_file_path = verse_index_path_for(csv_file_path)
+    source_sha = file_sha256(csv_file_path)
+
+    index = VerseIndex.load(index_file_path, source_sha)
+    if index is not None:
+        return index
+
+    logger.info(f"📝 Building verse lookup index {index_file_path}")
+    dataset = CsvBackend(csv_file_path, INDEX_COLUMNS)
+    index = VerseIndex.build(dataset)
+    try:
+        index.save(index_file_path, source_sha)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write {index_file_path}, keeping the index in memory: {e}")
+    return index
+
+
+def main():
+    """Build the lookup index for the dataset given on the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    csv_file_path = sys.argv[1] if len(sys.argv) > 1 else "quran_dataset.csv"
+    try:
+        index = load_verse_index(csv_file_path)
+        logger.info(f"✅ Indexed {len(index)} verses in {index.surah_count} surahs")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error building verse index: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Verse Store - Compiled binary form of the Quran dataset
+Lets the bot memory-map the corpus and read a single verse without parsing the CSV
+
+File layout (all integers little-endian):
+    header   magic b'QVS1', u16 version, u16 column count, u32 row count,
+             u64 source CSV size, 32-byte source CSV SHA-256
+    columns  per column: u16 byte length + UTF-8 column name
+    offsets  (rows * columns + 1) u32 heap offsets, row-major
+    heap     UTF-8 cell values stored back to back
+
+Build it once from the CSV and commit the result next to the dataset:
+    python verse_store.py quran_dataset.csv quran_dataset.qvs
+"""
+
+import csv
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'QVS1'
+VERSION = 1
+STORE_EXTENSION = '.qvs'
+
+_HEADER = struct.Struct('<4sHHIQ32s')
+_NAME_LEN = struct.Struct('<H')
+_OFFSET = struct.Struct('<I')
+
+
+def store_path_for(csv_file_path: str) -> str:
+    """Return the compiled store path that sits next to a CSV dataset"""
+    return os.path.splitext(csv_file_path)[0] + STORE_EXTENSION
+
+
+def file_sha256(path: str) -> bytes:
+    """Hash a file in chunks so large datasets never sit in memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def matches_source(csv_file_path: str, source_size: int, source_sha256: bytes) -> bool:
+    """Whether a sidecar stamped with (size, SHA-256) was built from this CSV
+
+    The size check only rejects early; an edit that keeps the size is still
+    caught by the hash.
+    """
+    try:
+        if os.path.getsize(csv_file_path) != source_size:
+            return False
+        return file_sha256(csv_file_path) == source_sha256
+    except OSError:
+        return False
+
+
+def write_store(store_file_path: str, columns: list, records, source_path: str) -> int:
+    """Write rows of string values into a verse store stamped with its source file"""
+    offsets = [0]
+    heap = bytearray()
+    rows = 0
+    for record in records:
+        if len(record) != len(columns):
+            raise ValueError(f"Row {rows + 1} has {len(record)} fields, expected {len(columns)}")
+        for value in record:
+            heap += value.encode('utf-8')
+            offsets.append(len(heap))
+        rows += 1
+
+    if len(heap) > 0xFFFFFFFF:
+        raise ValueError("Dataset too large for 32-bit heap offsets")
+
+    tmp_path = store_file_path + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, len(columns), rows,
+                               os.path.getsize(source_path), file_sha256(source_path)))
+        for name in columns:
+            encoded = name.encode('utf-8')
+            out.write(_NAME_LEN.pack(len(encoded)))
+            out.write(encoded)
+        out.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        out.write(heap)
+    os.replace(tmp_path, store_file_path)
+    return rows
+
+
+def compile_store(csv_file_path: str, store_file_path: str = None) -> str:
+    """Compile a CSV dataset into an indexed binary verse store"""
+    store_file_path = store_file_path or store_path_for(csv_file_path)
+
+    with open(csv_file_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        columns = next(reader, None)
+        if not columns:
+            raise ValueError(f"Dataset has no header row: {csv_file_path}")
+        rows = write_store(store_file_path, columns, (r for r in reader if r), csv_file_path)
+
+    logger.info(f"📦 Compiled {rows} verses into {store_file_path}")
+    return store_file_path
+
+
+class VerseStore:
+    """Read-only, memory-mapped view over a compiled verse store"""
+
+    def __init__(self, store_file_path: str):
+        self.store_file_path = store_file_path
+        self._file = open(store_file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        magic, version, ncols, nrows, source_size, source_sha = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a verse store (or unsupported version): {store_file_path}")
+
+        self.source_size = source_size
+        self.source_sha256 = source_sha
+        self._ncols = ncols
+        self._nrows = nrows
+
+        pos = _HEADER.size
+        self.columns = []
+        for _ in range(ncols):
+            (length,) = _NAME_LEN.unpack_from(self._map, pos)
+            pos += _NAME_LEN.size
+            self.columns.append(self._map[pos:pos + length].decode('utf-8'))
+            pos += length
+
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+        self._offsets_start = pos
+        self._heap_start = pos + (nrows * ncols + 1) * _OFFSET.size
+        self._row_offsets = struct.Struct(f'<{ncols + 1}I')
+
+    def __len__(self) -> int:
+        return self._nrows
+
+    def matches_source(self, csv_file_path: str) -> bool:
+        """Check the store was compiled from this CSV"""
+        return matches_source(csv_file_path, self.source_size, self.source_sha256)
+
+    def row(self, index: int, columns=None) -> dict:
+        """Decode a single verse row (optionally only some columns) without touching any other record"""
+        if not 0 <= index < self._nrows:
+            raise IndexError(f"Verse index {index} out of range (0-{self._nrows - 1})")
+
+        bounds = self._row_offsets.unpack_from(
+            self._map, self._offsets_start + index * self._ncols * _OFFSET.size)
+        heap = self._heap_start
+        positions = self._positions if columns is None else {name: self._positions[name] for name in columns}
+        return {
+            name: self._map[heap + bounds[i]:heap + bounds[i + 1]].decode('utf-8')
+            for name, i in positions.items()
+        }
+
+    def __getitem__(self, index: int) -> dict:
+        return self.row(index)
+
+    def close(self):
+        """Release the memory map and file handle"""
+        self._map.close()
+        self._file.close()
+
+
+def main():
+    """Compile the dataset given on the command line"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    csv_file_path = sys.argv[1] if len(sys.argv) > 1 else "quran_dataset.csv"
+    store_file_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    try:
+        compile_store(csv_file_path, store_file_path)
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error compiling verse store: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Webhook - Minimal asyncio HTTP server that receives Telegram updates
+Requests must carry the secret token given to setWebhook. Updates are de-duplicated
+by update_id and handed to the same handlers as polling mode. A handler may return
+a Bot API call, which goes back in the HTTP response instead of a separate request.
+
+Try it locally (no Telegram needed):
+    curl -H 'X-Telegram-Bot-Api-Secret-Token: <secret>' -d @update.json http://127.0.0.1:8443/webhook
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'x-telegram-bot-api-secret-token'
+
+# Telegram updates are small; anything bigger is not from Telegram
+MAX_BODY_BYTES = 1 << 20
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large'}
+
+
+class RecentUpdates:
+    """Bounded memory of update_ids already accepted (Telegram redelivers on timeouts)"""
+
+    def __init__(self, size: int = 10000):
+        self._order = deque()
+        self._seen = set()
+        self.size = size
+
+    def seen(self, update_id) -> bool:
+        """Record update_id; True if it had already been recorded"""
+        if update_id in self._seen:
+            return True
+        self._seen.add(update_id)
+        self._order.append(update_id)
+        if len(self._order) > self.size:
+            self._seen.discard(self._order.popleft())
+        return False
+
+
+class WebhookServer:
+    """Serves POST {path}; handle_update(update) returns None or a Bot API call dict
+    ({'method': 'sendMessage', ...}) to send back inline"""
+
+    def __init__(self, handle_update, secret_token: str, path: str = '/webhook',
+                 host: str = '0.0.0.0', port: int = 8443, workers: int = 8,
+                 dedup_size: int = 10000):
+        self.handle_update = handle_update
+        self.secret_token = secret_token or ''
+        self.path = path
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.recent = RecentUpdates(dedup_size)
+        self.received = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.inline_replies = 0
+        self.ready = threading.Event()
+        self._loop = None
+        self._stopped = None
+        self._pool = None
+        self._connections = set()
+        self._idle = {}
+
+    def stop(self, *_):
+        """Shut the server down; safe to call from a signal handler or another thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    def install_signal_handlers(self):
+        """Stop cleanly on SIGINT/SIGTERM"""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    async def process(self, method: str, path: str, headers: dict, body: bytes):
+        """Return (HTTP status, response payload or None) for one request"""
+        if path.split('?', 1)[0] != self.path:
+            return 404, None
+        if method != 'POST':
+            return 405, None
+        if not hmac.compare_digest(headers.get(SECRET_HEADER, '').encode(), self.secret_token.encode()):
+            self.rejected += 1
+            logger.warning("⚠️ Webhook request with a wrong secret token rejected")
+            return 401, None
+
+        try:
+            update = json.loads(body)
+            update_id = int(update['update_id'])
+        except (ValueError, TypeError, KeyError):
+            return 400, None
+
+        self.received += 1
+        if self.recent.seen(update_id):
+            self.duplicates += 1
+            return 200, None
+
+        try:
+            reply = await asyncio.get_running_loop().run_in_executor(self._pool, self.handle_update, update)
+        except Exception as e:
+            # Still 200: an error status would make Telegram redeliver the update
+            logger.error(f"❌ Update {update_id} failed: {e}")
+            return 200, None
+        if reply:
+            self.inline_replies += 1
+        return 200, reply
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while not self._stopped.is_set():
+                # Only connections parked here are closed at shutdown
+                self._idle[task] = writer
+                request_line = await reader.readline()
+                self._idle.pop(task, None)
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, None
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = await self.process(method, path, headers, body)
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+
+                content = json.dumps(payload).encode('utf-8') if payload else b''
+                head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(content)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                writer.write(head.encode('latin-1') + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(task)
+            self._idle.pop(task, None)
+            writer.close()
+
+    async def serve(self):
+        """Accept connections until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='webhook') as pool:
+            self._pool = pool
+            server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            # Port 0 picks a free port; publish the real one
+            self.port = server.sockets[0].getsockname()[1]
+            logger.info(f"🌐 Webhook listening on {self.host}:{self.port}{self.path}")
+            self.ready.set()
+            async with server:
+                await self._stopped.wait()
+                # Idle keep-alive connections see EOF and finish; in-flight requests complete
+                for writer in list(self._idle.values()):
+                    writer.transport.close()
+                await asyncio.gather(*self._connections, return_exceptions=True)
+
+        logger.info(f"🛑 Webhook stopped ({self.received} updates, {self.duplicates} duplicates, "
+                    f"{self.inline_replies} inline replies, {self.rejected} rejected)")
+
+    def run(self):
+        """Blocking entry point; returns when stopped"""
+        asyncio.run(self.serve())